@@ -328,8 +328,9 @@ class AudioPlugin(Plugin):
                 track_name = os.path.basename(self.current_track)
                 self.game.screen.addstr(4 + len(menu_options) + 2, 4, f"Now Playing: {track_name}", curses.A_BOLD)
                 
-            # Refresh the screen
-            self.game.screen.refresh()
+            # Refresh the screen in a single update
+            self.game.screen.noutrefresh()
+            curses.doupdate()
             
             # Get user input
             key = self.game.screen.getch()
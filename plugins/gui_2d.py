@@ -4,6 +4,7 @@ import math
 import json
 import os
 import traceback
+from collections import deque
 import pygame
 from pygame.locals import *
 import numpy as np
@@ -57,8 +58,8 @@ class GUI2DPlugin(Plugin):
         self.snakes = []
         
         # Debug messages
-        self.debug_messages = []
         self.max_debug_messages = 20  # Maximum number of debug messages to store
+        self.debug_messages = deque(maxlen=self.max_debug_messages)  # Oldest messages drop off automatically
         
         # Thread safety
         self.lock = threading.Lock()  # Lock for thread safety
@@ -102,14 +103,6 @@ class GUI2DPlugin(Plugin):
             
         # Update the character map
         self.update_character_map()
-        
-        # Force a refresh to ensure all drawing is complete before updating the GUI
-        try:
-            self.game.screen.refresh()
-            # Small sleep to ensure the terminal has fully rendered everything
-            time.sleep(0.05)
-        except:
-            pass
             
     def update_character_map(self):
         """Update the character map from the game world."""
@@ -117,13 +110,15 @@ class GUI2DPlugin(Plugin):
             return
             
         try:
-            # Get the screen dimensions
+            # Get the screen dimensions; the screen read is bound once for the
+            # per-cell loops below
+            inch = self.game.screen.inch
             max_y, max_x = self.game.screen.getmaxyx()
             
-            # Clear the character map
-            with self.lock:
-                self.character_map = []
-                self.characters = {}
+            # The new map is built without the lock and swapped in once at the end
+            character_map = []
+            characters = {}
+            snakes = []
                 
             # Get the player's position
             player_x = self.game.world_x
@@ -135,7 +130,7 @@ class GUI2DPlugin(Plugin):
                 for y in range(max_y):
                     for x in range(max_x):
                         try:
-                            char = chr(self.game.screen.inch(y, x) & 0xFF)
+                            char = chr(inch(y, x) & 0xFF)
                             if char in "╔═╗║╚╝":
                                 if self.border_top == 0 and char in "╔═╗":
                                     self.border_top = y
@@ -153,22 +148,19 @@ class GUI2DPlugin(Plugin):
                     self.has_border_info = True
                     self.add_debug_message(f"Border detected: T:{self.border_top} L:{self.border_left} B:{self.border_bottom} R:{self.border_right}")
             
-            # Process snakes separately
-            with self.lock:
-                self.snakes = []
-            
             # Iterate through the screen within the defined rendering boundaries
             render_top = self.border_top + 1 if self.has_border_info else 0
             render_bottom = self.border_bottom - 1 if self.has_border_info else max_y - 1
             render_left = self.border_left + 1 if self.has_border_info else 0
             render_right = self.border_right - 1 if self.has_border_info else max_x - 1
+            a_color = curses.A_COLOR
             
             for y in range(render_top, render_bottom + 1):
                 row = []
                 for x in range(render_left, render_right + 1):
                     try:
                         # Get the character at this position
-                        char_int = self.game.screen.inch(y, x)
+                        char_int = inch(y, x)
                         char = chr(char_int & 0xFF)
                         
                         # Skip empty spaces
@@ -177,7 +169,7 @@ class GUI2DPlugin(Plugin):
                             continue
                             
                         # Get color information
-                        color_pair = (char_int & curses.A_COLOR) >> 8
+                        color_pair = (char_int & a_color) >> 8
                         
                         # Calculate world coordinates
                         world_x = x - player_x
@@ -201,7 +193,7 @@ class GUI2DPlugin(Plugin):
                             
                             # Find or create a snake for this segment
                             found_snake = False
-                            for snake in self.snakes:
+                            for snake in snakes:
                                 # Check if this segment is adjacent to any segment in the snake
                                 for segment in snake:
                                     if (abs(segment["x"] - world_x) <= 1 and abs(segment["z"] - world_z) <= 1):
@@ -213,7 +205,7 @@ class GUI2DPlugin(Plugin):
                                     
                             if not found_snake:
                                 # Create a new snake
-                                self.snakes.append([snake_segment])
+                                snakes.append([snake_segment])
                         
                         # Add to character map
                         char_info = {
@@ -228,11 +220,17 @@ class GUI2DPlugin(Plugin):
                         
                         # Add to characters dictionary for quick lookup
                         key = f"{world_x},{world_z}"
-                        self.characters[key] = char_info
+                        characters[key] = char_info
                     except Exception as e:
                         row.append(None)
                         
-                self.character_map.append(row)
+                character_map.append(row)
+                
+            # Swap in the new map with a single lock acquisition
+            with self.lock:
+                self.character_map = character_map
+                self.characters = characters
+                self.snakes = snakes
                 
         except Exception as e:
             self.add_debug_message(f"Error updating character map: {str(e)}")
@@ -377,55 +375,59 @@ class GUI2DPlugin(Plugin):
             center_y = map_y + map_height // 2
             pygame.draw.circle(screen, (0, 255, 0), (center_x, center_y), 5)
             
-            # Draw characters
-            with self.lock:
-                for row in self.character_map:
-                    for char_info in row:
-                        if char_info is not None and not char_info["is_snake"]:
-                            # Calculate position on map
-                            x = center_x + char_info["x"] * 5
-                            y = center_y + char_info["z"] * 5
-                            
-                            # Skip if outside map
-                            if x < map_x or x > map_x + map_width or y < map_y or y > map_y + map_height:
-                                continue
-                            
-                            # Draw character
-                            color = (200, 200, 200)  # Default color
-                            pygame.draw.circle(screen, color, (int(x), int(y)), 2)
-            
-            # Draw snakes
+            # Take a snapshot of the latest published map; the update always swaps
+            # in new objects, so they can be drawn without holding the lock
             with self.lock:
-                for snake in self.snakes:
-                    for i, segment in enumerate(snake):
+                character_map = self.character_map
+                snakes = self.snakes
+                
+            # Draw characters
+            for row in character_map:
+                for char_info in row:
+                    if char_info is not None and not char_info["is_snake"]:
                         # Calculate position on map
-                        x = center_x + segment["x"] * 5
-                        y = center_y + segment["z"] * 5
+                        x = center_x + char_info["x"] * 5
+                        y = center_y + char_info["z"] * 5
                         
                         # Skip if outside map
                         if x < map_x or x > map_x + map_width or y < map_y or y > map_y + map_height:
                             continue
                         
-                        # Draw snake segment with different colors for head, body, and tail
-                        if i == 0:  # Head
-                            color = (0, 255, 0)  # Green
-                            size = 4
-                        elif i == len(snake) - 1:  # Tail
-                            color = (255, 0, 0)  # Red
-                            size = 3
-                        else:  # Body
-                            color = (0, 0, 255)  # Blue
-                            size = 3
-                            
-                        pygame.draw.circle(screen, color, (int(x), int(y)), size)
+                        # Draw character
+                        color = (200, 200, 200)  # Default color
+                        pygame.draw.circle(screen, color, (int(x), int(y)), 2)
+            
+            # Draw snakes
+            for snake in snakes:
+                for i, segment in enumerate(snake):
+                    # Calculate position on map
+                    x = center_x + segment["x"] * 5
+                    y = center_y + segment["z"] * 5
+                    
+                    # Skip if outside map
+                    if x < map_x or x > map_x + map_width or y < map_y or y > map_y + map_height:
+                        continue
+                    
+                    # Draw snake segment with different colors for head, body, and tail
+                    if i == 0:  # Head
+                        color = (0, 255, 0)  # Green
+                        size = 4
+                    elif i == len(snake) - 1:  # Tail
+                        color = (255, 0, 0)  # Red
+                        size = 3
+                    else:  # Body
+                        color = (0, 0, 255)  # Blue
+                        size = 3
                         
-                        # Draw line connecting segments
-                        if i > 0:
-                            prev_segment = snake[i-1]
-                            prev_x = center_x + prev_segment["x"] * 5
-                            prev_y = center_y + prev_segment["z"] * 5
-                            
-                            pygame.draw.line(screen, (100, 100, 100), (prev_x, prev_y), (x, y), 1)
+                    pygame.draw.circle(screen, color, (int(x), int(y)), size)
+                    
+                    # Draw line connecting segments
+                    if i > 0:
+                        prev_segment = snake[i-1]
+                        prev_x = center_x + prev_segment["x"] * 5
+                        prev_y = center_y + prev_segment["z"] * 5
+                        
+                        pygame.draw.line(screen, (100, 100, 100), (prev_x, prev_y), (x, y), 1)
             
             # Update the display
             pygame.display.flip()
@@ -566,9 +568,6 @@ class GUI2DPlugin(Plugin):
         """Add a debug message to the list of messages to display."""
         with self.lock:
             self.debug_messages.append(message)
-            # Limit the number of messages
-            if len(self.debug_messages) > self.max_debug_messages:
-                self.debug_messages.pop(0)
     
     def load_settings(self):
         """Load display settings from a file."""
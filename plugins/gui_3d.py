@@ -8,11 +8,19 @@ import traceback
 import curses  # Added for snake rendering on text map
 import json
 import hashlib
+import ctypes
 from datetime import datetime
+from collections import deque
 
 try:
     import pygame
     from pygame.locals import *
+    import OpenGL
+    # Skip PyOpenGL's glGetError check after every call; render_scene checks
+    # for errors once per frame instead. PyOpenGL reads this flag when its GL
+    # modules are first imported, so it must come before the imports below,
+    # and it applies to the whole process
+    OpenGL.ERROR_CHECKING = False
     from OpenGL.GL import *
     from OpenGL.GLU import *
     from OpenGL.GLUT import *
@@ -33,43 +41,145 @@ import curses
 from plugins.base import Plugin
 from keybindings import KeyBindings
 
-class Character3D:
-    """Represents a character in 3D space."""
-    
-    def __init__(self, char, x, y, color=(1.0, 1.0, 1.0, 1.0), height=None):
-        self.char = char
-        self.x = x
-        self.y = y
-        self.z = 0
-        self.color = color
-        # Allow external height to be provided, otherwise calculate it
-        self.height = height if height is not None else self.calculate_height()
-        
-    def calculate_height(self):
-        """Calculate height based on character."""
-        # Special characters have different heights
-        if self.char == 'X':
-            return 0.5  # Player is taller
-        elif self.char == '@':
-            return 0.3  # Plants are medium height
-        elif self.char == '0':
-            return 0.2  # Eggs are small
-        elif self.char == '&':
-            return 0.4  # Fuel is medium-tall
-        elif self.char == 'O':  # Remote players
-            return 0.5
-        else:
-            # Calculate height based on ASCII value (normalized)
-            return 0.1 + (ord(self.char) % 20) / 100.0
-            
-    def get_color(self):
-        """Get the color for this character."""
-        return self.color
+# Geometry of glutSolidCube(0.5) as 6 quads (24 vertices) with per-face normals
+_CUBE_HALF_SIZE = 0.25
+_CUBE_CORNERS = np.array([
+    (-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1),
+    (1, -1, -1), (1, -1, 1), (1, 1, 1), (1, 1, -1)
+], dtype=np.float32) * _CUBE_HALF_SIZE
+_CUBE_FACES = [(0, 1, 2, 3), (3, 2, 6, 7), (7, 6, 5, 4), (4, 5, 1, 0), (5, 6, 2, 1), (7, 4, 0, 3)]
+_CUBE_FACE_NORMALS = [(-1, 0, 0), (0, 1, 0), (1, 0, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)]
+_CUBE_VERTICES = _CUBE_CORNERS[np.array(_CUBE_FACES).ravel()]
+_CUBE_NORMALS = np.repeat(np.array(_CUBE_FACE_NORMALS, dtype=np.float32), 4, axis=0)
+
+# Interleaved character vertex: float position and normal, RGBA8 color
+_CHARACTER_VERTEX_DTYPE = np.dtype([
+    ('position', np.float32, 3),
+    ('normal', np.float32, 3),
+    ('color', np.uint8, 4)
+])
+
+# Characters drawn from the snake plugin rather than the character map
+_SNAKE_CHAR_CODES = np.frombuffer(b"~^*", dtype=np.uint8)
+
+# Colors for curses color pairs 1-7; index 0 is used for any other pair
+_COLOR_PAIR_COLORS = np.array([
+    (0.7, 0.7, 0.7),  # Light gray
+    (1.0, 1.0, 1.0),  # White
+    (1.0, 0.0, 0.0),  # Red
+    (0.0, 1.0, 0.0),  # Green
+    (1.0, 1.0, 0.0),  # Yellow
+    (0.0, 0.0, 1.0),  # Blue
+    (1.0, 0.0, 1.0),  # Magenta
+    (0.0, 1.0, 1.0)   # Cyan
+], dtype=np.float32)
+_COLOR_PAIR_RGBA8 = np.empty((len(_COLOR_PAIR_COLORS), 4), dtype=np.uint8)
+_COLOR_PAIR_RGBA8[:, :3] = np.round(_COLOR_PAIR_COLORS * 255)
+_COLOR_PAIR_RGBA8[:, 3] = 255
+
+
+# Snake segment types and their colors
+SNAKE_HEAD = 0
+SNAKE_BODY = 1
+SNAKE_TAIL = 2
+_SNAKE_SEGMENT_COLORS = np.array([
+    (1.0, 0.0, 0.0),  # Head is red
+    (0.0, 0.0, 0.5),  # Body is dark blue
+    (1.0, 1.0, 0.0)   # Tail/rattle is yellow
+], dtype=np.float32)
+
+
+def _step_number_setting(setting, direction):
+    """Move a numeric menu setting one step, clamped to its range."""
+    value = setting["value"] + direction * setting["step"]
+    setting["value"] = min(setting["max"], max(setting["min"], value))
+
+
+def _cycle_option_setting(setting, direction):
+    """Move an option menu setting to the previous or next option."""
+    options = setting["options"]
+    idx = setting["option_index"].get(setting["value"], -1)
+    setting["value"] = options[(idx + direction) % len(options)]
+
+
+# Value formatters and Left/Right handlers for each settings menu row type
+_SETTING_FORMATTERS = {
+    "bool": lambda value: "Yes" if value else "No",
+    "float": str,
+    "int": str,
+    "str": str
+}
+_SETTING_ADJUSTERS = {
+    "float": _step_number_setting,
+    "int": _step_number_setting,
+    "str": _cycle_option_setting
+}
+
+
+def _hsv_to_rgb(h, s, v):
+    """Convert HSV colors (arrays of components in [0, 1]) to RGB rows (N, 3)."""
+    # Branchless form: each channel is a clamped triangle wave of the hue
+    h6 = np.asarray(h, dtype=np.float64)[:, np.newaxis] * 6.0
+    channels = np.clip(np.abs(h6 - (3.0, 2.0, 4.0)) * (1.0, -1.0, -1.0) + (-1.0, 2.0, 2.0), 0.0, 1.0)
+    return v * (1.0 - s * (1.0 - channels))
+
+
+# Colors of the special game characters; every other character gets a hue
+# from its character code
+_SPECIAL_CHAR_COLORS = {
+    'X': (1.0, 0.0, 0.0, 1.0),  # Player: red
+    '@': (0.0, 0.8, 0.0, 1.0),  # Plants: green
+    '0': (1.0, 0.5, 0.0, 1.0),  # Eggs: orange
+    '&': (0.0, 1.0, 1.0, 1.0),  # Fuel: cyan
+    '.': (0.5, 0.25, 0.0, 1.0)  # Dots: brown
+}
+
+# RGBA color for each hue, indexed by character code modulo 360
+_HUE_RGB = [(r, g, b, 1.0) for r, g, b in _hsv_to_rgb(np.arange(360) / 360.0, 0.7, 0.7).tolist()]
+
+
+def _color_for_char(char):
+    """Get the RGBA color for a character; it depends only on the character."""
+    color = _SPECIAL_CHAR_COLORS.get(char)
+    if color is None:
+        color = _HUE_RGB[ord(char) % 360]
+    return color
+
+
+# The same colors as RGBA8, indexed by 8-bit character code
+_CHAR_CODE_RGBA8 = (np.array([_color_for_char(chr(code)) for code in range(256)]) * 255 + 0.5).astype(np.uint8)
 
 
 class GUI3DPlugin(Plugin):
     """Plugin that provides a 3D visualization of the game world."""
     
+    # Options the settings menu cycles through for the terrain style and color scheme
+    _MESH_STYLES = ("filled", "wireframe")
+    _MESH_STYLE_IDX = {style: i for i, style in enumerate(_MESH_STYLES)}
+    _TERRAIN_SCHEMES = ("height", "viridis", "viridis_inverted", "plasma", "inferno", "magma", "cividis")
+    _SCHEME_IDX = {scheme: i for i, scheme in enumerate(_TERRAIN_SCHEMES)}
+    
+    # Settings shown in the 3D settings menu: (attribute, label, type, extra options)
+    _SETTINGS_SCHEMA = (
+        ("show_letters", "Show Letters", "bool", {}),
+        ("show_sticks", "Show Sticks", "bool", {}),
+        ("show_dots_without_sticks", "Show Dots Without Sticks", "bool", {}),
+        ("show_mesh", "Show Mesh", "bool", {}),
+        ("show_terrain_mesh", "Show Terrain Mesh", "bool", {}),
+        ("terrain_mesh_style", "Terrain Mesh Style", "str", {"options": _MESH_STYLES, "option_index": _MESH_STYLE_IDX}),
+        ("terrain_mesh_opacity", "Terrain Mesh Opacity", "float", {"min": 0.1, "max": 1.0, "step": 0.1}),
+        ("terrain_color_scheme", "Terrain Color Scheme", "str", {"options": _TERRAIN_SCHEMES, "option_index": _SCHEME_IDX}),
+        ("stick_dot_size", "Stick Dot Size", "float", {"min": 1.0, "max": 20.0, "step": 1.0}),
+        ("show_snake_connections", "Show Snake Connections", "bool", {}),
+        ("render_distance", "Render Distance", "int", {"min": 10, "max": 1000, "step": 10}),
+        ("show_axes", "Show Axes", "bool", {}),
+        ("show_zero_level_grid", "Show Zero Level Grid", "bool", {}),
+        ("ascii_intensity", "ASCII Intensity", "bool", {}),
+        ("ascii_height", "ASCII Height", "bool", {}),
+        ("fullscreen", "Fullscreen", "bool", {}),
+    )
+    _SETTING_KEYS = tuple(entry[0] for entry in _SETTINGS_SCHEMA)
+    
     def __init__(self, game):
         """Initialize the plugin."""
         super().__init__(game)
@@ -110,14 +220,59 @@ class GUI3DPlugin(Plugin):
         self.pre_fullscreen_size = (800, 600)
         self.original_fullscreen = False
         
-        # Character map
-        self.character_map = []
-        self.characters = {}
-        self.snakes = []
+        # Visible characters stored as flat arrays: positions (N, 3), character
+        # codes (N,) and colors, either curses color pairs (N,) or RGBA8 (N, 4);
+        # snake characters are excluded
+        self.char_positions = np.empty((0, 3), dtype=np.float32)
+        self.char_codes = np.empty(0, dtype=np.uint8)
+        self.char_colors = np.empty(0, dtype=np.uint8)
+        
+        # Game frame and render distance the character map was last built for,
+        # plus the raw screen cells and scan origin it was built from
+        self._last_frame_key = None
+        self._last_scan_cells = None
+        self._last_scan_key = None
+        
+        # Scene updates are coalesced to at most one per _map_update_interval
+        # seconds; rendering keeps running at full rate on the last arrays
+        self._map_update_interval = 0.05
+        self._last_map_time = 0.0
+        
+        # Set whenever something visible changes; the GL thread only redraws
+        # the scene while this is set
+        self._dirty = True
+        
+        # Snake segments stored as flat arrays: positions (S, 2), types (S,), the
+        # number of visible segments in each snake and the lengths of the
+        # unbroken runs they form after culling
+        self.snake_positions = np.empty((0, 2), dtype=np.float32)
+        self.snake_types = np.empty(0, dtype=np.uint8)
+        self.snake_counts = np.empty(0, dtype=np.int32)
+        self.snake_runs = np.empty(0, dtype=np.int32)
+        
+        # Cached references to other plugins (resolved on first use)
+        self._plugin_refs_resolved = False
+        self._snake_plugin = None
+        
+        # Reference grid dimensions
+        self.grid_size = 20
+        self.grid_step = 1
+        
+        # Display lists for static geometry (compiled on first use)
+        self._sphere_list = None
+        self._grid_list = None
+        self._ground_list = None
+        self._grid_list_key = None  # (grid_size, grid_step) the grid and ground lists were built with
+        self._axes_list = None
+        
+        # Cube vertices for the last published character map, kept in a VBO
+        self._character_vbo = None
+        self._character_vertex_count = 0
+        self._character_batch_source = None
         
         # Debug messages
-        self.debug_messages = []
         self.max_debug_messages = 20  # Maximum number of debug messages to store
+        self.debug_messages = deque(maxlen=self.max_debug_messages)  # Oldest messages drop off automatically
         
         # Thread safety
         self.lock = threading.Lock()  # Lock for thread safety
@@ -125,16 +280,29 @@ class GUI3DPlugin(Plugin):
         # Control settings
         self.handle_3d_input = True
         
+        # Display settings (overridden by load_settings)
+        self.show_letters = True
+        self.show_sticks = True
+        self.show_mesh = True
+        self.ascii_intensity = True
+        self.ascii_height = False
+        self.fullscreen = False
+        
         # Terrain visualization settings
         self.show_dots_without_sticks = True
         self.stick_dot_size = 5.0
-        self.terrain_mesh_style = "solid"  # "wireframe" or "solid"
+        self.terrain_mesh_style = "filled"  # "filled" or "wireframe"
         self.terrain_mesh_opacity = 0.7
         self.terrain_color_scheme = "height"  # "height", "viridis", "plasma", etc.
         self.show_terrain_mesh = True
         self.show_snakes = True
+        self.show_snake_connections = True
+        self.render_distance = 100  # Maximum distance (in cells) from the player to draw
+        self.show_axes = True
+        self.show_zero_level_grid = True
         
         # Load settings if they exist
+        self._saved_settings = None  # Settings as last loaded from or written to disk
         self.load_settings()
         
         # Start the GUI thread
@@ -183,18 +351,16 @@ class GUI3DPlugin(Plugin):
         if not self.active or not self.running:
             return
             
+        # Skip ticks that arrive faster than the scene needs refreshing
+        now = time.monotonic()
+        if now - self._last_map_time < self._map_update_interval:
+            return
+        self._last_map_time = now
+            
         # Update the character map
         self.update_character_map()
-        
-        # Force a refresh to ensure all drawing is complete before updating the 3D GUI
-        try:
-            self.game.screen.refresh()
-            # Small sleep to ensure the terminal has fully rendered everything
-            time.sleep(0.01)
-        except:
-            pass
             
-        # Check for snakes directly
+        # Rebuild the snake list (the only place snakes are processed per tick)
         self.check_for_snakes()
         
         # No need to update debug info here as it's handled elsewhere
@@ -205,66 +371,111 @@ class GUI3DPlugin(Plugin):
         if not self.active or not self.running:
             return
             
-        # Find the snake plugin
-        snake_plugin = None
-        for plugin in self.game.plugins:
-            if hasattr(plugin, 'snakes') and plugin.active and plugin.__class__.__name__ == "SnakePlugin":
-                snake_plugin = plugin
-                break
+        # Use the cached snake plugin, if it is loaded and active
+        self._refresh_plugin_refs()
+        snake_plugin = self._snake_plugin
+        if snake_plugin is not None and not snake_plugin.active:
+            snake_plugin = None
                 
-        # Skip if no snake plugin found
-        if not snake_plugin:
-            # Clear the snakes list
-            with self.lock:
-                self.snakes = []
+        # Build the new snake arrays outside the lock and publish them in one step
+        positions, types, counts, runs = self._rebuild_snakes(snake_plugin)
+        if (np.array_equal(runs, self.snake_runs) and np.array_equal(types, self.snake_types)
+                and np.array_equal(counts, self.snake_counts)
+                and np.array_equal(positions, self.snake_positions)):
             return
-            
-        # Skip if the plugin has no snakes
-        if not hasattr(snake_plugin, 'snakes') or not snake_plugin.snakes:
-            # Clear the snakes list
-            with self.lock:
-                self.snakes = []
+        with self.lock:
+            self.snake_positions = positions
+            self.snake_types = types
+            self.snake_counts = counts
+            self.snake_runs = runs
+            self._dirty = True
+            
+    def _refresh_plugin_refs(self):
+        """Resolve and cache the reference to the snake plugin."""
+        if self._plugin_refs_resolved:
             return
             
-        # Process each snake
-        for snake_idx, snake in enumerate(snake_plugin.snakes):
+        # The plugin list is fixed once the game has started, so scan it only once
+        for plugin in self.game.plugins:
+            class_name = plugin.__class__.__name__
+            if class_name == "SnakePlugin" and hasattr(plugin, 'snakes'):
+                self._snake_plugin = plugin
+        self._plugin_refs_resolved = True
+        
+    def _rebuild_snakes(self, snake_plugin):
+        """Build the snake segment positions, types, counts and run lengths from the snake plugin."""
+        bodies = []
+        body_types = []
+        counts = []
+        runs = []
+        render_distance = self.render_distance
+        for snake in getattr(snake_plugin, 'snakes', None) or []:
             # Skip if the snake has no body
-            if not hasattr(snake, 'body') or not snake.body:
+            if not snake.body:
+                continue
+                
+            # Mark the first and last segment on the whole body, so the cull
+            # below cannot turn a visible body segment into a head or tail
+            body = np.asarray(snake.body, dtype=np.float32).reshape(-1, 2)
+            types = np.full(len(body), SNAKE_BODY, dtype=np.uint8)
+            types[-1] = SNAKE_TAIL
+            types[0] = SNAKE_HEAD
+            
+            # Body positions are relative to the player, so cull them against the
+            # render distance with a single vectorized (Chebyshev) test
+            keep = np.maximum(np.abs(body[:, 0]), np.abs(body[:, 1])) <= render_distance
+            kept = np.flatnonzero(keep)
+            if not len(kept):
                 continue
                 
-            # Get the snake's body segments
-            snake_segments = []
-            
-            # Add each segment to the list
-            # Note: We're just storing the positions, not rendering anything here
-            for segment_idx, (x, y) in enumerate(snake.body):
-                snake_segments.append((x, y))
-            
-            # Add this snake's segments to the snakes list
-            if snake_segments:
-                with self.lock:
-                    # Replace any existing snake with the same index
-                    while len(self.snakes) <= snake_idx:
-                        self.snakes.append([])
-                    self.snakes[snake_idx] = snake_segments
+            # Split the visible segments into separate runs wherever culled
+            # segments left a gap, so no connection is drawn across it
+            breaks = np.flatnonzero(np.diff(kept) > 1) + 1
+            runs.extend(np.diff(np.concatenate(([0], breaks, [len(kept)]))).tolist())
+            counts.append(len(kept))
+            bodies.append(body[kept])
+            body_types.append(types[kept])
+                
+        if not bodies:
+            return (np.empty((0, 2), dtype=np.float32),
+                    np.empty(0, dtype=np.uint8),
+                    np.empty(0, dtype=np.int32),
+                    np.empty(0, dtype=np.int32))
+                    
+        return (np.concatenate(bodies), np.concatenate(body_types),
+                np.array(counts, dtype=np.int32), np.array(runs, dtype=np.int32))
+        
+    def reset_character_map_cache(self):
+        """Forget the last screen scan so the next update rebuilds and republishes the map."""
+        # Needed whenever another plugin swaps update_character_map in or out:
+        # the published arrays then no longer come from the cached scan
+        self._last_frame_key = None
+        self._last_scan_key = None
+        self._last_scan_cells = None
         
     def update_character_map(self):
         """Update the 3D character map from the game world."""
         if not self.active or not self.running:
             return
             
+        # The screen only changes when the game draws a frame, so there is
+        # nothing new to read until it has drawn another one; the key is only
+        # recorded once an update has succeeded, so a failed scan is retried
+        game = self.game
+        render_distance = self.render_distance
+        frame_key = (game.frame_version, render_distance)
+        if frame_key == self._last_frame_key:
+            return
+            
         try:
-            # Get the screen dimensions
-            max_y, max_x = self.game.screen.getmaxyx()
+            # Get the screen dimensions; the screen read is bound once for the
+            # per-cell loops below
+            inch = game.screen.inch
+            max_y, max_x = game.screen.getmaxyx()
             
-            # Clear the character map
-            with self.lock:
-                self.character_map = []
-                self.characters = {}
-                
             # Get the player's position
-            player_x = self.game.player_x
-            player_y = self.game.player_y
+            player_x = game.player_x
+            player_y = game.player_y
             
             # Get the border information if we haven't already
             if not self.has_border_info:
@@ -272,7 +483,7 @@ class GUI3DPlugin(Plugin):
                 for y in range(max_y):
                     for x in range(max_x):
                         try:
-                            char = chr(self.game.screen.inch(y, x) & 0xFF)
+                            char = chr(inch(y, x) & 0xFF)
                             if char in "╔═╗║╚╝":
                                 if self.border_top == 0 and char in "╔═╗":
                                     self.border_top = y
@@ -290,89 +501,57 @@ class GUI3DPlugin(Plugin):
                     self.has_border_info = True
                     self.add_debug_message(f"Border detected: T:{self.border_top} L:{self.border_left} B:{self.border_bottom} R:{self.border_right}")
             
-            # Process snakes separately to avoid OpenGL errors
-            with self.lock:
-                self.snakes = []
-            
-            # Process snakes in the text map only, not in 3D visualization
-            # This ensures snakes are visible in the text map but won't cause pygame errors
-            
             # Iterate through the screen within the defined rendering boundaries
             render_top = self.border_top + 1 if self.has_border_info else 0
             render_bottom = self.border_bottom - 1 if self.has_border_info else max_y - 1
             render_left = self.border_left + 1 if self.has_border_info else 0
             render_right = self.border_right - 1 if self.has_border_info else max_x - 1
             
-            for y in range(render_top, render_bottom + 1):
-                row = []
-                for x in range(render_left, render_right + 1):
-                    try:
-                        # Get the character at this position
-                        char_int = self.game.screen.inch(y, x)
-                        char = chr(char_int & 0xFF)
-                        
-                        # Skip empty spaces
-                        if char == " ":
-                            row.append(None)
-                            continue
-                            
-                        # Get color information
-                        color_pair = (char_int & curses.A_COLOR) >> 8
-                        
-                        # Calculate world coordinates
-                        world_x = x - player_x
-                        world_z = y - player_y
-                        
-                        # Determine height based on ASCII value
-                        world_y = ord(char) / 50.0  # Scale the height
-                        
-                        # Check if this is a snake character
-                        is_snake = False
-                        if char in "~^*":
-                            is_snake = True
-                            # Add to snakes list for special rendering
-                            snake_segment = {
-                                "x": world_x,
-                                "y": world_y,
-                                "z": world_z,
-                                "char": char,
-                                "color": color_pair
-                            }
-                            
-                            # Find or create a snake for this segment
-                            found_snake = False
-                            for snake in self.snakes:
-                                # Check if this segment is adjacent to any segment in the snake
-                                for segment in snake:
-                                    if (abs(segment["x"] - world_x) <= 1 and abs(segment["z"] - world_z) <= 1):
-                                        snake.append(snake_segment)
-                                        found_snake = True
-                                        break
-                                if found_snake:
-                                    break
-                                    
-                            if not found_snake:
-                                # Create a new snake
-                                self.snakes.append([snake_segment])
-                        
-                        # Add to character map
-                        char_info = {
-                            "char": char,
-                            "x": world_x,
-                            "y": world_y,
-                            "z": world_z,
-                            "color": color_pair,
-                            "is_snake": is_snake
-                        }
-                        row.append(char_info)
-                        
-                        # Add to characters dictionary for quick lookup
-                        key = f"{world_x},{world_z}"
-                        self.characters[key] = char_info
-                    except Exception as e:
-                        row.append(None)
-                        
-                self.character_map.append(row)
+            # Read the whole render area in one pass; the new arrays are built
+            # without the lock and published once at the end
+            rows = range(render_top, render_bottom + 1)
+            cols = range(render_left, render_right + 1)
+            cells = np.array([inch(y, x) for y in rows for x in cols], dtype=np.int64)
+            cells = cells.reshape(len(rows), len(cols))
+            
+            # Most updates see an unchanged screen; keep the published arrays (and
+            # the uploaded vertex buffer built from them) unless something moved
+            scan_key = (render_top, render_left, player_x, player_y, render_distance)
+            if scan_key == self._last_scan_key and np.array_equal(cells, self._last_scan_cells):
+                self._last_frame_key = frame_key
+                return
+            
+            codes = (cells & 0xFF).astype(np.uint8)
+            
+            # Skip empty spaces; snake characters are drawn from the snake plugin,
+            # not the map
+            visible = (codes != ord(' ')) & ~np.isin(codes, _SNAKE_CHAR_CODES)
+            
+            # Cells beyond the render distance from the player are dropped before
+            # any per-character arrays are built
+            dz = np.abs(np.arange(len(rows)) + (render_top - player_y))
+            dx = np.abs(np.arange(len(cols)) + (render_left - player_x))
+            visible &= np.maximum(dz[:, np.newaxis], dx[np.newaxis, :]) <= render_distance
+            ys, xs = np.nonzero(visible)
+            codes = codes[ys, xs]
+            
+            # World coordinates relative to the player; the height is based on
+            # the ASCII value
+            positions = np.empty((len(codes), 3), dtype=np.float32)
+            positions[:, 0] = xs + (render_left - player_x)
+            positions[:, 1] = codes / 50.0
+            positions[:, 2] = ys + (render_top - player_y)
+            colors = ((cells[ys, xs] & curses.A_COLOR) >> 8).astype(np.uint8)
+                
+            # Swap in the new arrays with a single lock acquisition
+            with self.lock:
+                self.char_positions = positions
+                self.char_codes = codes
+                self.char_colors = colors
+                self._dirty = True
+            self._last_scan_key = scan_key
+            self._last_scan_cells = cells
+            self._last_frame_key = frame_key
                 
         except Exception as e:
             self.add_debug_message(f"Error updating character map: {str(e)}")
@@ -380,44 +559,11 @@ class GUI3DPlugin(Plugin):
     
     def get_color_for_char(self, char, x, y):
         """Get the color for a character."""
-        if char == 'X':  # Player
-            return (1.0, 0.0, 0.0, 1.0)  # Red
-        elif char == '@':  # Plants
-            return (0.0, 0.8, 0.0, 1.0)  # Green
-        elif char == '0':  # Eggs
-            return (1.0, 0.5, 0.0, 1.0)  # Orange
-        elif char == '&':  # Fuel
-            return (0.0, 1.0, 1.0, 1.0)  # Cyan
-        elif char == '.':  # Dots
-            return (0.5, 0.25, 0.0, 1.0)  # Brown
-        else:
-            # Generate color based on character code
-            h = (ord(char) % 360) / 360.0
-            s = 0.7
-            v = 0.7
-            
-            # Convert HSV to RGB
-            if s == 0.0:
-                return (v, v, v, 1.0)
-                
-            i = int(h * 6.0)
-            f = (h * 6.0) - i
-            p = v * (1.0 - s)
-            q = v * (1.0 - s * f)
-            t = v * (1.0 - s * (1.0 - f))
-            
-            if i % 6 == 0:
-                return (v, t, p, 1.0)
-            elif i % 6 == 1:
-                return (q, v, p, 1.0)
-            elif i % 6 == 2:
-                return (p, v, t, 1.0)
-            elif i % 6 == 3:
-                return (p, q, v, 1.0)
-            elif i % 6 == 4:
-                return (t, p, v, 1.0)
-            else:
-                return (v, p, q, 1.0)
+        return _color_for_char(char)
+        
+    def get_colors_for_codes(self, codes):
+        """Get the RGBA8 colors (N, 4) for an array of 8-bit character codes."""
+        return _CHAR_CODE_RGBA8[codes]
     
     def get_color_from_scheme(self, height, scheme):
         """Get color based on height and selected color scheme."""
@@ -657,8 +803,12 @@ class GUI3DPlugin(Plugin):
             clock = pygame.time.Clock()
             
             while self.running:
-                # Process events
-                for event in pygame.event.get():
+                # Process events; any event (input, expose, resize) may change
+                # what is on screen
+                events = pygame.event.get()
+                if events:
+                    self._dirty = True
+                for event in events:
                     if event.type == pygame.QUIT:
                         self.running = False
                     elif event.type == pygame.KEYDOWN:
@@ -672,6 +822,16 @@ class GUI3DPlugin(Plugin):
                     elif event.type == pygame.MOUSEMOTION:
                         self.handle_mouse_motion(event)
                 
+                # Nothing changed since the last frame: poll again shortly
+                # instead of redrawing an identical scene
+                if not self._dirty:
+                    pygame.time.wait(5)
+                    continue
+                    
+                # Clear the flag before drawing so changes published while
+                # this frame renders are picked up by the next one
+                self._dirty = False
+                
                 # Render the scene
                 self.render_scene()
                 
@@ -705,17 +865,30 @@ class GUI3DPlugin(Plugin):
             # Draw a grid for reference
             self.draw_grid()
             
-            # Draw the characters
+            # Take a snapshot of the latest published data; the update thread always
+            # swaps in new objects, so they can be drawn without holding the lock
             with self.lock:
-                for row in self.character_map:
-                    for char_info in row:
-                        if char_info is not None:
-                            self.draw_character(char_info)
+                char_positions = self.char_positions
+                char_colors = self.char_colors
+                snake_positions = self.snake_positions
+                snake_types = self.snake_types
+                snake_runs = self.snake_runs
                 
-                # Draw snakes
-                if self.show_snakes:
-                    for snake in self.snakes:
-                        self.draw_snake(snake)
+            # Draw the characters
+            self.draw_characters(char_positions, char_colors)
+            
+            # Draw snakes
+            if self.show_snakes:
+                self.draw_snakes(snake_positions, snake_types)
+                if self.show_snake_connections:
+                    self.draw_snake_connections(snake_positions, snake_runs)
+            
+            # Report any GL error raised while drawing this frame; PyOpenGL's
+            # per-call checking is off (see the OpenGL import at the top of this
+            # module), so this is the only place GL errors are detected
+            error = glGetError()
+            if error != GL_NO_ERROR:
+                self.add_debug_message(f"OpenGL error while rendering: {error:#06x}")
             
             # Swap the buffers to display what we just drew
             pygame.display.flip()
@@ -726,12 +899,32 @@ class GUI3DPlugin(Plugin):
             
     def draw_grid(self):
         """Draw a reference grid."""
+        # The grid is static, so compile it once and rebuild only if its size changes
+        grid_key = (self.grid_size, self.grid_step)
+        if self._grid_list is None or self._grid_list_key != grid_key:
+            if self._grid_list is not None:
+                glDeleteLists(self._grid_list, 1)
+                glDeleteLists(self._ground_list, 1)
+            self._grid_list = self.compile_grid_list(*grid_key)
+            self._ground_list = self.compile_ground_list(self.grid_size)
+            self._grid_list_key = grid_key
+        if self._axes_list is None:
+            self._axes_list = self.compile_axes_list()
+            
+        if self.show_zero_level_grid:
+            glCallList(self._grid_list)
+        if self.show_axes:
+            glCallList(self._axes_list)
+        glCallList(self._ground_list)
+        
+    def compile_grid_list(self, grid_size, grid_step):
+        """Compile the reference grid lines into a display list."""
+        grid_list = glGenLists(1)
+        glNewList(grid_list, GL_COMPILE)
+        
         glBegin(GL_LINES)
         
         # Draw grid lines
-        grid_size = 20
-        grid_step = 1
-        
         glColor3f(0.2, 0.2, 0.2)  # Dark gray
         
         for i in range(-grid_size, grid_size + 1, grid_step):
@@ -745,6 +938,14 @@ class GUI3DPlugin(Plugin):
             
         glEnd()
         
+        glEndList()
+        return grid_list
+        
+    def compile_axes_list(self):
+        """Compile the coordinate axes into a display list."""
+        axes_list = glGenLists(1)
+        glNewList(axes_list, GL_COMPILE)
+        
         # Draw coordinate axes
         glBegin(GL_LINES)
         
@@ -765,6 +966,14 @@ class GUI3DPlugin(Plugin):
         
         glEnd()
         
+        glEndList()
+        return axes_list
+        
+    def compile_ground_list(self, grid_size):
+        """Compile the ground plane into a display list."""
+        ground_list = glGenLists(1)
+        glNewList(ground_list, GL_COMPILE)
+        
         # Draw a plane for the ground
         glBegin(GL_QUADS)
         glColor3f(0.1, 0.3, 0.2)  # Dark green-blue for the ground
@@ -774,295 +983,119 @@ class GUI3DPlugin(Plugin):
         glVertex3f(grid_size, 0, -grid_size)
         glEnd()
         
-    def draw_character(self, char_info):
-        """Draw a character in 3D space."""
-        if not char_info:
-            return
-            
-        x = char_info["x"]
-        y = char_info["y"]
-        z = char_info["z"]
-        char = char_info["char"]
-        color_pair = char_info["color"]
-        is_snake = char_info["is_snake"]
+        glEndList()
+        return ground_list
         
-        # Skip drawing snakes here, they're drawn separately
-        if is_snake:
+    def draw_characters(self, positions, colors):
+        """Draw all characters as cubes with a single batched draw call."""
+        # Upload new vertex data only when new characters have been published;
+        # the map update has already dropped those beyond the render distance
+        if positions is not self._character_batch_source:
+            self.upload_character_batch(self.build_character_batch(positions, colors))
+            self._character_batch_source = positions
+        if not self._character_vertex_count:
             return
             
-        # Set color based on color pair
-        if color_pair == 1:  # Default
-            glColor3f(1.0, 1.0, 1.0)  # White
-        elif color_pair == 2:  # Red
-            glColor3f(1.0, 0.0, 0.0)  # Red
-        elif color_pair == 3:  # Green
-            glColor3f(0.0, 1.0, 0.0)  # Green
-        elif color_pair == 4:  # Yellow
-            glColor3f(1.0, 1.0, 0.0)  # Yellow
-        elif color_pair == 5:  # Blue
-            glColor3f(0.0, 0.0, 1.0)  # Blue
-        elif color_pair == 6:  # Magenta
-            glColor3f(1.0, 0.0, 1.0)  # Magenta
-        elif color_pair == 7:  # Cyan
-            glColor3f(0.0, 1.0, 1.0)  # Cyan
-        else:
-            glColor3f(0.7, 0.7, 0.7)  # Light gray
-            
-        # Draw a cube for the character
-        glPushMatrix()
-        glTranslatef(x, y, z)
-        glutSolidCube(0.5)
-        glPopMatrix()
+        stride = _CHARACTER_VERTEX_DTYPE.itemsize
+        fields = _CHARACTER_VERTEX_DTYPE.fields
+        glBindBuffer(GL_ARRAY_BUFFER, self._character_vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        try:
+            glVertexPointer(3, GL_FLOAT, stride, ctypes.c_void_p(fields['position'][1]))
+            glNormalPointer(GL_FLOAT, stride, ctypes.c_void_p(fields['normal'][1]))
+            glColorPointer(4, GL_UNSIGNED_BYTE, stride, ctypes.c_void_p(fields['color'][1]))
+            glDrawArrays(GL_QUADS, 0, self._character_vertex_count)
+        finally:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_NORMAL_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            
+    def upload_character_batch(self, vertex_data):
+        """Copy the interleaved character vertices into the character VBO."""
+        if vertex_data is None:
+            self._character_vertex_count = 0
+            return
+        if self._character_vbo is None:
+            self._character_vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self._character_vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self._character_vertex_count = len(vertex_data)
+        
+    def build_character_batch(self, positions, colors):
+        """Build the interleaved cube vertices (position, normal, color) for the characters."""
+        if not len(positions):
+            return None
+            
+        # Colors are either RGBA8 already or curses color pairs to look up
+        if colors.ndim == 1:
+            color_pairs = colors.astype(np.intp)
+            color_pairs[color_pairs >= len(_COLOR_PAIR_COLORS)] = 0
+            colors = _COLOR_PAIR_RGBA8[color_pairs]
+            
+        # Expand each character into the 24 vertices of a cube
+        count = len(positions)
+        vertex_data = np.empty((count, len(_CUBE_VERTICES)), dtype=_CHARACTER_VERTEX_DTYPE)
+        vertex_data['position'] = positions[:, np.newaxis, :] + _CUBE_VERTICES
+        vertex_data['normal'] = _CUBE_NORMALS
+        vertex_data['color'] = colors[:, np.newaxis, :]
+        return vertex_data.ravel()
         
-    def draw_snake(self, snake):
-        """Draw a snake in 3D space."""
-        if not snake:
+    def compile_sphere_list(self):
+        """Compile the snake segment sphere into a display list."""
+        sphere_list = glGenLists(1)
+        glNewList(sphere_list, GL_COMPILE)
+        glutSolidSphere(0.3, 8, 8)
+        glEndList()
+        return sphere_list
+        
+    def draw_snakes(self, positions, types):
+        """Draw a sphere for every snake segment."""
+        if not len(positions):
             return
             
-        # Draw each segment
-        segments = snake.segments if hasattr(snake, 'segments') else snake
-        for i, segment in enumerate(segments):
-            try:
-                # Handle different segment formats
-                if isinstance(segment, dict):
-                    x, y = segment.get('x', 0), segment.get('y', 0)
-                elif isinstance(segment, (list, tuple)) and len(segment) >= 2:
-                    x, y = segment[0], segment[1]
-                else:
-                    continue  # Skip invalid segments
-                
-                z = 0.3  # Slightly above the ground
-                
+        # The sphere is the same for every segment, so tessellate it only once
+        sphere_list = self._sphere_list
+        if sphere_list is None:
+            sphere_list = self._sphere_list = self.compile_sphere_list()
+            
+        # Draw the segments grouped by type so the color is set once per group
+        for segment_type, (r, g, b) in enumerate(_SNAKE_SEGMENT_COLORS.tolist()):
+            group = positions[types == segment_type]
+            if not len(group):
+                continue
+            glColor3f(r, g, b)
+            for x, y in group.tolist():
                 glPushMatrix()
-                glTranslatef(x, z, y)  # Note: y and z are swapped in OpenGL
-                
-                # Head is red
-                if i == 0:
-                    glColor3f(1.0, 0.0, 0.0)  # Red
-                # Tail/rattle is yellow
-                elif i == len(segments) - 1:
-                    glColor3f(1.0, 1.0, 0.0)  # Yellow
-                # Body is dark blue (as per user memory)
-                else:
-                    glColor3f(0.0, 0.0, 0.5)  # Dark blue
-                    
-                # Draw a sphere for each segment
-                glutSolidSphere(0.3, 8, 8)
-                
+                glTranslatef(x, 0.3, y)  # Slightly above the ground; y and z are swapped in OpenGL
+                glCallList(sphere_list)
                 glPopMatrix()
-                
-                # Draw connections between segments
-                if i > 0:
-                    # Get previous segment
-                    prev_segment = segments[i-1]
-                    if isinstance(prev_segment, dict):
-                        prev_x, prev_y = prev_segment.get('x', 0), prev_segment.get('y', 0)
-                    elif isinstance(prev_segment, (list, tuple)) and len(prev_segment) >= 2:
-                        prev_x, prev_y = prev_segment[0], prev_segment[1]
-                    else:
-                        continue
-                    
-                    prev_z = 0.3  # Slightly above the ground
-                    
-                    glColor3f(0.0, 0.0, 0.4)  # Darker blue for connections
-                    
-                    glBegin(GL_LINES)
-                    glVertex3f(prev_x, prev_z, prev_y)  # Note: y and z are swapped in OpenGL
-                    glVertex3f(x, z, y)  # Note: y and z are swapped in OpenGL
-                    glEnd()
-            except Exception as e:
-                self.add_debug_message(f"Error drawing snake segment: {str(e)}")
     
-    def handle_key_event(self, event):
-        """Handle keyboard events."""
-        try:
-            if event.key == pygame.K_ESCAPE:
-                self.running = False
-            elif event.key == pygame.K_f:
-                self.toggle_fullscreen()
-            # Forward WASD keys to the game for player movement
-            elif event.key in [pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d]:
-                self.forward_key_to_game(event.key)
-            
-        except Exception as e:
-            self.add_debug_message(f"Error handling key event: {e}")
-    
-    def forward_key_to_game(self, key):
-        """Forward key presses to the main game for player movement."""
-        try:
-            # Map pygame keys to curses keys
-            key_map = {
-                pygame.K_w: curses.KEY_UP,
-                pygame.K_a: curses.KEY_LEFT,
-                pygame.K_s: curses.KEY_DOWN,
-                pygame.K_d: curses.KEY_RIGHT
-            }
+    def draw_snake_connections(self, positions, counts):
+        """Draw the lines connecting snake segments for all snake runs in one call."""
+        # Single-segment runs have nothing to connect
+        firsts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int32)
+        connected = counts > 1
+        if not connected.any():
+            return
             
-            if key in key_map:
-                # Get the corresponding curses key
-                curses_key = key_map[key]
-                
-                # Call the game's handle_input method with this key
-                if hasattr(self.game, 'handle_input'):
-                    # Use threading to avoid blocking the pygame event loop
-                    threading.Thread(
-                        target=self.game.handle_input,
-                        args=(curses_key,),
-                        daemon=True
-                    ).start()
-                    
-                    # Add a debug message
-                    direction = {
-                        curses.KEY_UP: "up",
-                        curses.KEY_LEFT: "left",
-                        curses.KEY_DOWN: "down",
-                        curses.KEY_RIGHT: "right"
-                    }.get(curses_key, "unknown")
-                    
-                    self.add_debug_message(f"Sent {direction} command to game")
-                
-        except Exception as e:
-            self.add_debug_message(f"Error forwarding key to game: {e}")
-    
-    def handle_mouse_button_down(self, event):
-        """Handle mouse button down events."""
-        try:
-            if event.button == 1:  # Left mouse button
-                self.dragging = True
-                self.last_mouse_pos = pygame.mouse.get_pos()
-            elif event.button == 3:  # Right mouse button
-                # Toggle fullscreen on right-click
-                self.toggle_fullscreen()
-            elif event.button == 4:  # Scroll up
-                # Zoom in functionality could be implemented here
-                pass
-            elif event.button == 5:  # Scroll down
-                # Zoom out functionality could be implemented here
-                pass
-                
-        except Exception as e:
-            self.add_debug_message(f"Error handling mouse button down: {e}")
-    
-    def handle_mouse_button_up(self, event):
-        """Handle mouse button up events."""
+        vertices = np.empty((len(positions), 3), dtype=np.float32)
+        vertices[:, 0] = positions[:, 0]
+        vertices[:, 1] = 0.3  # Slightly above the ground
+        vertices[:, 2] = positions[:, 1]  # Note: y and z are swapped in OpenGL
+        
+        # One line strip per unbroken run of segments
+        glColor3f(0.0, 0.0, 0.4)  # Darker blue for connections
+        glEnableClientState(GL_VERTEX_ARRAY)
         try:
-            if hasattr(self, 'dragging') and self.dragging:
-                self.dragging = False
-                
-        except Exception as e:
-            self.add_debug_message(f"Error handling mouse button up: {e}")
+            glVertexPointer(3, GL_FLOAT, 0, vertices)
+            glMultiDrawArrays(GL_LINE_STRIP, firsts[connected], counts[connected], int(connected.sum()))
+        finally:
+            glDisableClientState(GL_VERTEX_ARRAY)
     
-    def handle_mouse_motion(self, event):
-        """Handle mouse motion events."""
-        try:
-            if hasattr(self, 'dragging') and self.dragging:
-                x, y = pygame.mouse.get_pos()
-                if hasattr(self, 'last_mouse_pos') and self.last_mouse_pos:
-                    dx = x - self.last_mouse_pos[0]
-                    dy = y - self.last_mouse_pos[1]
-                    # Use dx and dy for dragging functionality
-                    # For example, panning the 3D map view
-                self.last_mouse_pos = (x, y)
-                
-        except Exception as e:
-            self.add_debug_message(f"Error handling mouse motion: {e}")
-
-    def handle_key_down(self, event):
-        """Handle key down events."""
-        try:
-            # Check if we should handle this key
-            if not self.handle_3d_input:
-                return
-                
-            # Handle key presses
-            if event.key == pygame.K_ESCAPE:
-                # Exit fullscreen mode if in fullscreen
-                if self.is_fullscreen:
-                    self.toggle_fullscreen()
-                # Otherwise, quit the GUI
-                else:
-                    self.running = False
-            elif event.key == pygame.K_F11 or (event.key == pygame.K_RETURN and event.mod & pygame.KMOD_ALT):
-                # Toggle fullscreen
-                self.toggle_fullscreen()
-            
-            # Camera controls
-            elif event.key == pygame.K_UP or event.key == pygame.K_w:
-                # Forward key - move forward in the direction we're facing
-                # Forward the key to the game for player movement
-                if self.game:
-                    self.game.handle_key('w')
-            elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                # Backward key - move backward from the direction we're facing
-                # Forward the key to the game for player movement
-                if self.game:
-                    self.game.handle_key('s')
-            elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                # Left key - move left from the direction we're facing
-                # Forward the key to the game for player movement
-                if self.game:
-                    self.game.handle_key('a')
-            elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                # Right key - move right from the direction we're facing
-                # Forward the key to the game for player movement
-                if self.game:
-                    self.game.handle_key('d')
-            elif event.key == pygame.K_PAGEUP:
-                # Move up
-                self.camera_y += self.camera_move_speed
-            elif event.key == pygame.K_PAGEDOWN:
-                # Move down
-                self.camera_y -= self.camera_move_speed
-            elif event.key == pygame.K_HOME:
-                # Reset camera position
-                self.camera_x = 0
-                self.camera_y = 10
-                self.camera_z = 0
-                self.rotation_x = 30
-                self.rotation_y = 0
-                
-        except Exception as e:
-            self.add_debug_message(f"Error handling key down: {str(e)}")
-            
-    def handle_key_up(self, event):
-        """Handle key up events."""
-        try:
-            # Check if we should handle this key
-            if not self.handle_3d_input:
-                return
-                
-            # Handle key releases
-            pass
-            
-        except Exception as e:
-            self.add_debug_message(f"Error handling key up: {str(e)}")
-            
-    def toggle_fullscreen(self):
-        """Toggle fullscreen mode."""
-        try:
-            # Toggle fullscreen flag
-            self.is_fullscreen = not self.is_fullscreen
-            
-            # Remember current size if going to fullscreen
-            if self.is_fullscreen:
-                self.pre_fullscreen_size = pygame.display.get_surface().get_size()
-                
-            # Set new display mode - always use regular pygame (no OpenGL)
-            flags = pygame.FULLSCREEN if self.is_fullscreen else 0
-            flags |= pygame.DOUBLEBUF
-                
-            # Create new screen
-            self.screen = pygame.display.set_mode(
-                (0, 0) if self.is_fullscreen else self.pre_fullscreen_size,
-                flags
-            )
-                
-            # Update width and height
-            self.width, self.height = pygame.display.get_surface().get_size()
-            
-        except Exception as e:
-            self.add_debug_message(f"Error toggling fullscreen: {e}")
-
     def load_settings(self):
         """Load display settings from a file."""
         try:
@@ -1075,6 +1108,9 @@ class GUI3DPlugin(Plugin):
                 self.show_mesh = settings.get("show_mesh", True)
                 self.show_terrain_mesh = settings.get("show_terrain_mesh", True)
                 self.terrain_mesh_style = settings.get("terrain_mesh_style", "filled")
+                # Older settings files may hold the former default "solid"
+                if self.terrain_mesh_style not in self._MESH_STYLE_IDX:
+                    self.terrain_mesh_style = "filled"
                 self.terrain_mesh_opacity = settings.get("terrain_mesh_opacity", 0.7)
                 self.terrain_color_scheme = settings.get("terrain_color_scheme", "height")
                 self.stick_dot_size = settings.get("stick_dot_size", 8.0)
@@ -1084,463 +1120,178 @@ class GUI3DPlugin(Plugin):
                 self.show_zero_level_grid = settings.get("show_zero_level_grid", True)
                 self.ascii_intensity = settings.get("ascii_intensity", True)
                 self.ascii_height = settings.get("ascii_height", False)
+            self._saved_settings = self.get_settings_dict()
         except:
             # Use default settings if file doesn't exist or is invalid
             pass
     
+    def get_settings_dict(self):
+        """Get the persistent display settings as a dictionary."""
+        return {
+            "show_letters": self.show_letters,
+            "show_sticks": self.show_sticks,
+            "show_dots_without_sticks": self.show_dots_without_sticks,
+            "show_mesh": self.show_mesh,
+            "show_terrain_mesh": self.show_terrain_mesh,
+            "terrain_mesh_style": self.terrain_mesh_style,
+            "terrain_mesh_opacity": self.terrain_mesh_opacity,
+            "terrain_color_scheme": self.terrain_color_scheme,
+            "stick_dot_size": self.stick_dot_size,
+            "show_snake_connections": self.show_snake_connections,
+            "render_distance": self.render_distance,
+            "show_axes": self.show_axes,
+            "show_zero_level_grid": self.show_zero_level_grid,
+            "ascii_intensity": self.ascii_intensity,
+            "ascii_height": self.ascii_height
+        }
+    
     def save_settings(self):
         """Save display settings to a file."""
+        settings = self.get_settings_dict()
+        
+        # Nothing to do if the settings match what is already on disk
+        if settings == self._saved_settings:
+            return
+            
+        # Write to a temporary file and swap it in so a failed write never
+        # leaves a truncated settings file behind
+        temp_path = "gui_3d_settings.json.tmp"
         try:
-            import json
-            with open("gui_3d_settings.json", "w") as f:
-                settings = {
-                    "show_letters": self.show_letters,
-                    "show_sticks": self.show_sticks,
-                    "show_dots_without_sticks": self.show_dots_without_sticks,
-                    "show_mesh": self.show_mesh,
-                    "show_terrain_mesh": self.show_terrain_mesh,
-                    "terrain_mesh_style": self.terrain_mesh_style,
-                    "terrain_mesh_opacity": self.terrain_mesh_opacity,
-                    "terrain_color_scheme": self.terrain_color_scheme,
-                    "stick_dot_size": self.stick_dot_size,
-                    "show_snake_connections": self.show_snake_connections,
-                    "render_distance": self.render_distance,
-                    "show_axes": self.show_axes,
-                    "show_zero_level_grid": self.show_zero_level_grid,
-                    "ascii_intensity": self.ascii_intensity,
-                    "ascii_height": self.ascii_height
-                }
-                json.dump(settings, f)
-        except:
-            # Ignore errors
-            pass
+            with open(temp_path, "w") as f:
+                json.dump(settings, f, separators=(",", ":"))
+            os.replace(temp_path, "gui_3d_settings.json")
+            self._saved_settings = settings
+        except (OSError, TypeError, ValueError) as e:
+            self.add_debug_message(f"Error saving settings: {e}")
 
-    def show_settings_menu(self):
-        """Show the settings menu for the 3D visualization plugin."""
+    def show_3d_settings_menu(self):
+        """Show the 3D settings menu."""
         # Store original settings in case user cancels
-        original_show_letters = self.show_letters
-        original_show_sticks = self.show_sticks
-        original_show_dots_without_sticks = self.show_dots_without_sticks
-        original_show_mesh = self.show_mesh
-        original_show_terrain_mesh = self.show_terrain_mesh
-        original_terrain_mesh_style = self.terrain_mesh_style
-        original_terrain_mesh_opacity = self.terrain_mesh_opacity
-        original_terrain_color_scheme = self.terrain_color_scheme
-        original_stick_dot_size = self.stick_dot_size
-        original_show_snake_connections = self.show_snake_connections
-        original_render_distance = self.render_distance
-        original_show_axes = self.show_axes
-        original_show_zero_level_grid = self.show_zero_level_grid
-        original_ascii_intensity = self.ascii_intensity
-        original_ascii_height = self.ascii_height
-        
-        # Variables for menu navigation
-        current_selection = 0
-        in_settings_menu = True
+        originals = {key: getattr(self, key) for key in self._SETTING_KEYS}
         
         # Create settings list
         settings = [
-            {"name": "Show Letters", "value": self.show_letters, "type": "bool"},
-            {"name": "Show Sticks", "value": self.show_sticks, "type": "bool"},
-            {"name": "Show Dots Without Sticks", "value": self.show_dots_without_sticks, "type": "bool"},
-            {"name": "Show Mesh", "value": self.show_mesh, "type": "bool"},
-            {"name": "Show Terrain Mesh", "value": self.show_terrain_mesh, "type": "bool"},
-            {"name": "Terrain Mesh Style", "value": self.terrain_mesh_style, "type": "str"},
-            {"name": "Terrain Mesh Opacity", "value": self.terrain_mesh_opacity, "type": "float", "min": 0.1, "max": 1.0, "step": 0.1},
-            {"name": "Terrain Color Scheme", "value": self.terrain_color_scheme, "type": "str"},
-            {"name": "Stick Dot Size", "value": self.stick_dot_size, "type": "float", "min": 1.0, "max": 20.0, "step": 1.0},
-            {"name": "Show Snake Connections", "value": self.show_snake_connections, "type": "bool"},
-            {"name": "Render Distance", "value": self.render_distance, "type": "int", "min": 10, "max": 1000, "step": 10},
-            {"name": "Show Axes", "value": self.show_axes, "type": "bool"},
-            {"name": "Show Zero Level Grid", "value": self.show_zero_level_grid, "type": "bool"},
-            {"name": "ASCII Intensity", "value": self.ascii_intensity, "type": "bool"},
-            {"name": "ASCII Height", "value": self.ascii_height, "type": "bool"},
-            {"name": "Save Settings", "value": None, "type": "button"},
-            {"name": "Cancel", "value": None, "type": "button"}
+            {"name": name, "value": getattr(self, key), "type": setting_type, **extra}
+            for key, name, setting_type, extra in self._SETTINGS_SCHEMA
         ]
+        settings.append({"name": "Save Settings", "value": None, "type": "button"})
+        settings.append({"name": "Cancel", "value": None, "type": "button"})
         
         # Variables for menu navigation
         current_selection = 0
         in_menu = True
+        screen = self.game.screen
+        addstr = screen.addstr
+        clrtoeol = screen.clrtoeol
+        chgat = screen.chgat
+        menu_color = self.game.menu_color
+        selected_color = menu_color | curses.A_BOLD
+        separator = self.game.get_menu_separator()
+        format_setting = self.format_setting_row
         
-        # Main loop for settings menu
-        while in_menu:
-            # Clear screen
-            self.game.screen.clear()
-            
-            # Draw header
-            self.game.screen.addstr(0, 0, "3D Visualization Settings", self.game.menu_color | curses.A_BOLD)
-            self.game.screen.addstr(1, 0, "═" * (self.game.max_x - 1), self.game.menu_color)
-            
-            # Draw instructions
-            self.game.screen.addstr(2, 0, "Use ↑/↓ to navigate, ENTER to toggle/edit, ←/→ to adjust values", self.game.menu_color)
-            self.game.screen.addstr(3, 0, "Press ESC to exit without saving", self.game.menu_color)
-            self.game.screen.addstr(4, 0, "═" * (self.game.max_x - 1), self.game.menu_color)
-            
-            # Draw settings
-            for i, setting in enumerate(settings):
-                # Highlight the selected item
-                if i == current_selection:
-                    attr = self.game.menu_color | curses.A_BOLD
-                else:
-                    attr = self.game.menu_color
-                
-                # Draw the item
-                if setting["type"] == "bool":
-                    value_str = "Yes" if setting["value"] else "No"
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}: {value_str}", attr)
-                elif setting["type"] == "float" or setting["type"] == "int":
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}: {setting['value']}", attr)
-                elif setting["type"] == "str":
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}: {setting['value']}", attr)
-                else:
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}", attr)
-            
-            # Draw footer
-            self.game.screen.addstr(self.game.max_y - 2, 0, "═" * (self.game.max_x - 1), self.game.menu_color)
-            
-            # Refresh screen
-            self.game.screen.refresh()
-            
-            # Get input
-            key = self.game.screen.getch()
-            
-            # Handle input
-            if key == curses.KEY_UP:
-                current_selection = (current_selection - 1) % len(settings)
-            elif key == curses.KEY_DOWN:
-                current_selection = (current_selection + 1) % len(settings)
-            elif key == 10:  # Enter key
-                # Handle selection
-                setting = settings[current_selection]
-                if setting["type"] == "bool":
-                    # Toggle boolean value
-                    setting["value"] = not setting["value"]
-                elif setting["type"] == "button":
-                    if setting["name"] == "Save Settings":
-                        # Save settings
-                        self.show_letters = settings[0]["value"]
-                        self.show_sticks = settings[1]["value"]
-                        self.show_dots_without_sticks = settings[2]["value"]
-                        self.show_mesh = settings[3]["value"]
-                        self.show_terrain_mesh = settings[4]["value"]
-                        self.terrain_mesh_style = settings[5]["value"]
-                        self.terrain_mesh_opacity = settings[6]["value"]
-                        self.terrain_color_scheme = settings[7]["value"]
-                        self.stick_dot_size = settings[8]["value"]
-                        self.show_snake_connections = settings[9]["value"]
-                        self.render_distance = settings[10]["value"]
-                        self.show_axes = settings[11]["value"]
-                        self.show_zero_level_grid = settings[12]["value"]
-                        self.ascii_intensity = settings[13]["value"]
-                        self.ascii_height = settings[14]["value"]
-                        self.save_settings()
-                        in_menu = False
-                    elif setting["name"] == "Cancel":
-                        # Restore original settings
-                        self.show_letters = original_show_letters
-                        self.show_sticks = original_show_sticks
-                        self.show_dots_without_sticks = original_show_dots_without_sticks
-                        self.show_mesh = original_show_mesh
-                        self.show_terrain_mesh = original_show_terrain_mesh
-                        self.terrain_mesh_style = original_terrain_mesh_style
-                        self.terrain_mesh_opacity = original_terrain_mesh_opacity
-                        self.terrain_color_scheme = original_terrain_color_scheme
-                        self.stick_dot_size = original_stick_dot_size
-                        self.show_snake_connections = original_show_snake_connections
-                        self.render_distance = original_render_distance
-                        self.show_axes = original_show_axes
-                        self.show_zero_level_grid = original_show_zero_level_grid
-                        self.ascii_intensity = original_ascii_intensity
-                        self.ascii_height = original_ascii_height
-                        in_menu = False
-            elif key == curses.KEY_LEFT:
-                # Decrease value
-                setting = settings[current_selection]
-                if setting["type"] == "float":
-                    # Check if min and step exist, use defaults if not
-                    min_val = setting.get("min", 0.0)
-                    step = setting.get("step", 0.1)
-                    setting["value"] = max(min_val, setting["value"] - step)
-                elif setting["type"] == "int":
-                    # Check if min and step exist, use defaults if not
-                    min_val = setting.get("min", 0)
-                    step = setting.get("step", 1)
-                    setting["value"] = max(min_val, setting["value"] - step)
-                elif setting["type"] == "str" and setting["name"] == "Terrain Mesh Style":
-                    # Cycle through mesh style options
-                    if setting["value"] == "filled":
-                        setting["value"] = "wireframe"
-                    else:
-                        setting["value"] = "filled"
-                elif setting["type"] == "str" and setting["name"] == "Terrain Color Scheme":
-                    # Cycle through color scheme options
-                    schemes = ["height", "viridis", "viridis_inverted", "plasma", "inferno", "magma", "cividis"]
-                    idx = schemes.index(setting["value"])
-                    setting["value"] = schemes[(idx - 1) % len(schemes)]
-            elif key == curses.KEY_RIGHT:
-                # Increase value
-                setting = settings[current_selection]
-                if setting["type"] == "float":
-                    # Check if max and step exist, use defaults if not
-                    max_val = setting.get("max", 10.0)
-                    step = setting.get("step", 0.1)
-                    setting["value"] = min(max_val, setting["value"] + step)
-                elif setting["type"] == "int":
-                    # Check if max and step exist, use defaults if not
-                    max_val = setting.get("max", 100)
-                    step = setting.get("step", 1)
-                    setting["value"] = min(max_val, setting["value"] + step)
-                elif setting["type"] == "str" and setting["name"] == "Terrain Mesh Style":
-                    # Cycle through mesh style options
-                    if setting["value"] == "wireframe":
-                        setting["value"] = "filled"
-                    else:
-                        setting["value"] = "wireframe"
-                elif setting["type"] == "str" and setting["name"] == "Terrain Color Scheme":
-                    # Cycle through color scheme options
-                    schemes = ["height", "viridis", "viridis_inverted", "plasma", "inferno", "magma", "cividis"]
-                    idx = schemes.index(setting["value"])
-                    setting["value"] = schemes[(idx + 1) % len(schemes)]
-            elif key == 27:  # Escape key
-                # Restore original settings
-                self.show_letters = original_show_letters
-                self.show_sticks = original_show_sticks
-                self.show_dots_without_sticks = original_show_dots_without_sticks
-                self.show_mesh = original_show_mesh
-                self.show_terrain_mesh = original_show_terrain_mesh
-                self.terrain_mesh_style = original_terrain_mesh_style
-                self.terrain_mesh_opacity = original_terrain_mesh_opacity
-                self.terrain_color_scheme = original_terrain_color_scheme
-                self.stick_dot_size = original_stick_dot_size
-                self.show_snake_connections = original_show_snake_connections
-                self.render_distance = original_render_distance
-                self.show_axes = original_show_axes
-                self.show_zero_level_grid = original_show_zero_level_grid
-                self.ascii_intensity = original_ascii_intensity
-                self.ascii_height = original_ascii_height
-                in_menu = False
-        
-        # Force redraw
-        self.game.needs_redraw = True
-
-    def show_3d_settings_menu(self):
-        """Show the 3D settings menu."""
-        # Store original settings in case user cancels
-        original_show_letters = self.show_letters
-        original_show_sticks = self.show_sticks
-        original_show_dots_without_sticks = self.show_dots_without_sticks
-        original_show_mesh = self.show_mesh
-        original_show_terrain_mesh = self.show_terrain_mesh
-        original_terrain_mesh_style = self.terrain_mesh_style
-        original_terrain_mesh_opacity = self.terrain_mesh_opacity
-        original_terrain_color_scheme = self.terrain_color_scheme
-        original_stick_dot_size = self.stick_dot_size
-        original_show_snake_connections = self.show_snake_connections
-        original_render_distance = self.render_distance
-        original_show_axes = self.show_axes
-        original_show_zero_level_grid = self.show_zero_level_grid
-        original_ascii_intensity = self.ascii_intensity
-        original_ascii_height = self.ascii_height
-        original_fullscreen = self.fullscreen
+        # Draw the static parts of the menu once; afterwards only rows that
+        # change are redrawn
+        screen.clear()
         
-        # Variables for menu navigation
-        current_selection = 0
-        in_settings_menu = True
+        # Draw header
+        addstr(0, 0, "3D Visualization Settings", selected_color)
+        addstr(1, 0, separator, menu_color)
         
-        # Create settings list
-        settings = [
-            {"name": "Show Letters", "value": self.show_letters, "type": "bool"},
-            {"name": "Show Sticks", "value": self.show_sticks, "type": "bool"},
-            {"name": "Show Dots Without Sticks", "value": self.show_dots_without_sticks, "type": "bool"},
-            {"name": "Show Mesh", "value": self.show_mesh, "type": "bool"},
-            {"name": "Show Terrain Mesh", "value": self.show_terrain_mesh, "type": "bool"},
-            {"name": "Terrain Mesh Style", "value": self.terrain_mesh_style, "type": "str"},
-            {"name": "Terrain Mesh Opacity", "value": self.terrain_mesh_opacity, "type": "float", "min": 0.1, "max": 1.0, "step": 0.1},
-            {"name": "Terrain Color Scheme", "value": self.terrain_color_scheme, "type": "str"},
-            {"name": "Stick Dot Size", "value": self.stick_dot_size, "type": "float", "min": 1.0, "max": 20.0, "step": 1.0},
-            {"name": "Show Snake Connections", "value": self.show_snake_connections, "type": "bool"},
-            {"name": "Render Distance", "value": self.render_distance, "type": "int", "min": 10, "max": 1000, "step": 10},
-            {"name": "Show Axes", "value": self.show_axes, "type": "bool"},
-            {"name": "Show Zero Level Grid", "value": self.show_zero_level_grid, "type": "bool"},
-            {"name": "ASCII Intensity", "value": self.ascii_intensity, "type": "bool"},
-            {"name": "ASCII Height", "value": self.ascii_height, "type": "bool"},
-            {"name": "Fullscreen", "value": self.fullscreen, "type": "bool"},
-            {"name": "Save Settings", "value": None, "type": "button"},
-            {"name": "Cancel", "value": None, "type": "button"}
-        ]
+        # Draw instructions
+        addstr(2, 0, "Use ↑/↓ to navigate, ENTER to toggle/edit, ←/→ to adjust values", menu_color)
+        addstr(3, 0, "Press ESC to exit without saving", menu_color)
+        addstr(4, 0, separator, menu_color)
         
-        # Variables for menu navigation
-        current_selection = 0
-        in_menu = True
+        # Draw footer
+        addstr(self.game.max_y - 2, 0, separator, menu_color)
+        
+        # Draw all rows in a single call, then highlight the selection
+        row_text = [format_setting(setting) for setting in settings]
+        addstr(6, 2, "\n  ".join(row_text), menu_color)
+        chgat(current_selection + 6, 2, -1, selected_color)
         
         # Main loop for settings menu
         while in_menu:
-            # Clear screen
-            self.game.screen.clear()
-            
-            # Draw header
-            self.game.screen.addstr(0, 0, "3D Visualization Settings", self.game.menu_color | curses.A_BOLD)
-            self.game.screen.addstr(1, 0, "═" * (self.game.max_x - 1), self.game.menu_color)
-            
-            # Draw instructions
-            self.game.screen.addstr(2, 0, "Use ↑/↓ to navigate, ENTER to toggle/edit, ←/→ to adjust values", self.game.menu_color)
-            self.game.screen.addstr(3, 0, "Press ESC to exit without saving", self.game.menu_color)
-            self.game.screen.addstr(4, 0, "═" * (self.game.max_x - 1), self.game.menu_color)
-            
-            # Draw settings
-            for i, setting in enumerate(settings):
-                # Highlight the selected item
-                if i == current_selection:
-                    attr = self.game.menu_color | curses.A_BOLD
-                else:
-                    attr = self.game.menu_color
+            # Push the changes to the terminal in one update
+            screen.noutrefresh()
+            curses.doupdate()
+            
+            # Get input, coalescing keys that arrived together (key repeat
+            # or paste) into a single redraw
+            keys = self.game.read_keys()
+            if not keys:
+                continue
+            prev_selection = current_selection
+            
+            for key in keys:
+                # Handle input
+                if key == curses.KEY_UP:
+                    current_selection = (current_selection - 1) % len(settings)
+                elif key == curses.KEY_DOWN:
+                    current_selection = (current_selection + 1) % len(settings)
+                elif key == 10:  # Enter key
+                    # Handle selection
+                    setting = settings[current_selection]
+                    if setting["type"] == "bool":
+                        # Toggle boolean value
+                        setting["value"] = not setting["value"]
+                    elif setting["type"] == "button":
+                        if setting["name"] == "Save Settings":
+                            # Save settings
+                            for attr, row in zip(self._SETTING_KEYS, settings):
+                                setattr(self, attr, row["value"])
+                            self.save_settings()
+                            in_menu = False
+                        elif setting["name"] == "Cancel":
+                            self._restore_settings(originals)
+                            in_menu = False
+                elif key == curses.KEY_LEFT or key == curses.KEY_RIGHT:
+                    # Decrease or increase the value, depending on the setting type
+                    setting = settings[current_selection]
+                    adjust = _SETTING_ADJUSTERS.get(setting["type"])
+                    if adjust is not None:
+                        adjust(setting, -1 if key == curses.KEY_LEFT else 1)
+                elif key == 27:  # Escape key
+                    self._restore_settings(originals)
+                    in_menu = False
                 
-                # Draw the item
-                if setting["type"] == "bool":
-                    value_str = "Yes" if setting["value"] else "No"
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}: {value_str}", attr)
-                elif setting["type"] == "float" or setting["type"] == "int":
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}: {setting['value']}", attr)
-                elif setting["type"] == "str":
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}: {setting['value']}", attr)
-                else:
-                    self.game.screen.addstr(i + 6, 2, f"{setting['name']}", attr)
-            
-            # Draw footer
-            self.game.screen.addstr(self.game.max_y - 2, 0, "═" * (self.game.max_x - 1), self.game.menu_color)
-            
-            # Refresh screen
-            self.game.screen.refresh()
-            
-            # Get input
-            key = self.game.screen.getch()
-            
-            # Handle input
-            if key == curses.KEY_UP:
-                current_selection = (current_selection - 1) % len(settings)
-            elif key == curses.KEY_DOWN:
-                current_selection = (current_selection + 1) % len(settings)
-            elif key == 10:  # Enter key
-                # Handle selection
-                setting = settings[current_selection]
-                if setting["type"] == "bool":
-                    # Toggle boolean value
-                    setting["value"] = not setting["value"]
-                elif setting["type"] == "button":
-                    if setting["name"] == "Save Settings":
-                        # Save settings
-                        self.show_letters = settings[0]["value"]
-                        self.show_sticks = settings[1]["value"]
-                        self.show_dots_without_sticks = settings[2]["value"]
-                        self.show_mesh = settings[3]["value"]
-                        self.show_terrain_mesh = settings[4]["value"]
-                        self.terrain_mesh_style = settings[5]["value"]
-                        self.terrain_mesh_opacity = settings[6]["value"]
-                        self.terrain_color_scheme = settings[7]["value"]
-                        self.stick_dot_size = settings[8]["value"]
-                        self.show_snake_connections = settings[9]["value"]
-                        self.render_distance = settings[10]["value"]
-                        self.show_axes = settings[11]["value"]
-                        self.show_zero_level_grid = settings[12]["value"]
-                        self.ascii_intensity = settings[13]["value"]
-                        self.ascii_height = settings[14]["value"]
-                        self.fullscreen = settings[15]["value"]
-                        self.save_settings()
-                        in_menu = False
-                    elif setting["name"] == "Cancel":
-                        # Restore original settings
-                        self.show_letters = original_show_letters
-                        self.show_sticks = original_show_sticks
-                        self.show_dots_without_sticks = original_show_dots_without_sticks
-                        self.show_mesh = original_show_mesh
-                        self.show_terrain_mesh = original_show_terrain_mesh
-                        self.terrain_mesh_style = original_terrain_mesh_style
-                        self.terrain_mesh_opacity = original_terrain_mesh_opacity
-                        self.terrain_color_scheme = original_terrain_color_scheme
-                        self.stick_dot_size = original_stick_dot_size
-                        self.show_snake_connections = original_show_snake_connections
-                        self.render_distance = original_render_distance
-                        self.show_axes = original_show_axes
-                        self.show_zero_level_grid = original_show_zero_level_grid
-                        self.ascii_intensity = original_ascii_intensity
-                        self.ascii_height = original_ascii_height
-                        self.fullscreen = original_fullscreen
-                        in_menu = False
-            elif key == curses.KEY_LEFT:
-                # Decrease value
-                setting = settings[current_selection]
-                if setting["type"] == "float":
-                    # Check if min and step exist, use defaults if not
-                    min_val = setting.get("min", 0.0)
-                    step = setting.get("step", 0.1)
-                    setting["value"] = max(min_val, setting["value"] - step)
-                elif setting["type"] == "int":
-                    # Check if min and step exist, use defaults if not
-                    min_val = setting.get("min", 0)
-                    step = setting.get("step", 1)
-                    setting["value"] = max(min_val, setting["value"] - step)
-                elif setting["type"] == "str" and setting["name"] == "Terrain Mesh Style":
-                    # Cycle through mesh style options
-                    if setting["value"] == "filled":
-                        setting["value"] = "wireframe"
-                    else:
-                        setting["value"] = "filled"
-                elif setting["type"] == "str" and setting["name"] == "Terrain Color Scheme":
-                    # Cycle through color scheme options
-                    schemes = ["height", "viridis", "viridis_inverted", "plasma", "inferno", "magma", "cividis"]
-                    idx = schemes.index(setting["value"])
-                    setting["value"] = schemes[(idx - 1) % len(schemes)]
-            elif key == curses.KEY_RIGHT:
-                # Increase value
-                setting = settings[current_selection]
-                if setting["type"] == "float":
-                    # Check if max and step exist, use defaults if not
-                    max_val = setting.get("max", 10.0)
-                    step = setting.get("step", 0.1)
-                    setting["value"] = min(max_val, setting["value"] + step)
-                elif setting["type"] == "int":
-                    # Check if max and step exist, use defaults if not
-                    max_val = setting.get("max", 100)
-                    step = setting.get("step", 1)
-                    setting["value"] = min(max_val, setting["value"] + step)
-                elif setting["type"] == "str" and setting["name"] == "Terrain Mesh Style":
-                    # Cycle through mesh style options
-                    if setting["value"] == "wireframe":
-                        setting["value"] = "filled"
-                    else:
-                        setting["value"] = "wireframe"
-                elif setting["type"] == "str" and setting["name"] == "Terrain Color Scheme":
-                    # Cycle through color scheme options
-                    schemes = ["height", "viridis", "viridis_inverted", "plasma", "inferno", "magma", "cividis"]
-                    idx = schemes.index(setting["value"])
-                    setting["value"] = schemes[(idx + 1) % len(schemes)]
-            elif key == 27:  # Escape key
-                # Restore original settings
-                self.show_letters = original_show_letters
-                self.show_sticks = original_show_sticks
-                self.show_dots_without_sticks = original_show_dots_without_sticks
-                self.show_mesh = original_show_mesh
-                self.show_terrain_mesh = original_show_terrain_mesh
-                self.terrain_mesh_style = original_terrain_mesh_style
-                self.terrain_mesh_opacity = original_terrain_mesh_opacity
-                self.terrain_color_scheme = original_terrain_color_scheme
-                self.stick_dot_size = original_stick_dot_size
-                self.show_snake_connections = original_show_snake_connections
-                self.render_distance = original_render_distance
-                self.show_axes = original_show_axes
-                self.show_zero_level_grid = original_show_zero_level_grid
-                self.ascii_intensity = original_ascii_intensity
-                self.ascii_height = original_ascii_height
-                self.fullscreen = original_fullscreen
-                in_menu = False
-        
-        # Force redraw
+                # Ignore anything typed after the key that closed the menu
+                if not in_menu:
+                    break
+                
+            # Update only what these keys changed: rows whose value changed
+            # are rewritten, moving the selection just swaps the highlight
+            for i, setting in enumerate(settings):
+                text = format_setting(setting)
+                if text != row_text[i]:
+                    row_text[i] = text
+                    addstr(i + 6, 2, text, selected_color if i == current_selection else menu_color)
+                    clrtoeol()
+            if current_selection != prev_selection:
+                chgat(prev_selection + 6, 2, -1, menu_color)
+                chgat(current_selection + 6, 2, -1, selected_color)
+        
+        # Force redraw, in the terminal and in the 3D view
         self.game.needs_redraw = True
+        self._dirty = True
 
+    def _restore_settings(self, originals):
+        """Put back the settings captured when the settings menu was opened."""
+        for name, value in originals.items():
+            setattr(self, name, value)
+        
+    @staticmethod
+    def format_setting_row(setting):
+        """Format a single row of the settings menu."""
+        formatter = _SETTING_FORMATTERS.get(setting["type"])
+        if formatter is None:
+            return setting["name"]
+        return f"{setting['name']}: {formatter(setting['value'])}"
+        
     def show_connected_snakes(self, value):
         """Set whether to show snakes as connected balls."""
         self.show_snake_connections = value
+        self._dirty = True
         
         # Force a check for snakes to update the visualization
         self.check_for_snakes()
@@ -1651,13 +1402,13 @@ class GUI3DPlugin(Plugin):
     
     def add_debug_message(self, message):
         """Add a debug message to the list of messages to display."""
-        # Filter out any XYZ prefixes that might be in the message
-        message = message.replace("XYZ", "")
+        # Filter out any XYZ prefixes that might be in the message; messages
+        # are cleaned once here so rendering can use them as they are
+        if "XYZ" in message:
+            message = message.replace("XYZ", "")
         
-        self.debug_messages.append(message)
-        # Keep only the most recent messages
-        if len(self.debug_messages) > self.max_debug_messages:
-            self.debug_messages = self.debug_messages[-self.max_debug_messages:]
+        # The deque keeps only the most recent messages
+        self.debug_messages.append(message.strip())
     
     def render_debug_messages(self, screen):
         """Render debug messages at the bottom of the terminal."""
@@ -1680,10 +1431,8 @@ class GUI3DPlugin(Plugin):
             for i, message in enumerate(reversed(self.debug_messages)):
                 if i >= self.max_debug_messages:
                     break
-                # Clean the message to ensure no XYZ strings
-                clean_message = message.replace("XYZ", "").strip()
-                if clean_message:  # Only display non-empty messages
-                    screen.addstr(max_y - 2 - i, 0, clean_message[:max_x-1])
+                if message:  # Only display non-empty messages
+                    screen.addstr(max_y - 2 - i, 0, message[:max_x-1])
         except:
             # Silently handle any errors to prevent crashes
             pass
@@ -1691,55 +1440,19 @@ class GUI3DPlugin(Plugin):
     def render_debug_info(self):
         """Generate debug information string."""
         # Format the debug information string with specific content
-        if not self.snakes:
+        counts = self.snake_counts
+        if not len(counts):
             return "Drawing 0 snakes"
             
         # Format the debug message to match the requested format
-        debug_info = f"Drawing {len(self.snakes)} snakes"
+        debug_info = f"Drawing {len(counts)} snakes"
         
-        # Add snake segment information if available
-        if len(self.snakes) > 0:
-            for i in range(min(3, len(self.snakes))):
-                if hasattr(self.snakes[i], 'body'):
-                    debug_info += f" Snake {i+1} has {len(self.snakes[i].body)} segments"
+        # Add snake segment information
+        for i, count in enumerate(counts[:3].tolist()):
+            debug_info += f" Snake {i+1} has {count} segments"
                 
         return debug_info
     
-    def toggle_fullscreen(self):
-        """Toggle between fullscreen and windowed mode."""
-        try:
-            # Toggle fullscreen flag
-            self.is_fullscreen = not self.is_fullscreen
-            
-            # Remember current size if going to fullscreen
-            if self.is_fullscreen:
-                # Save current window size before going fullscreen
-                self.pre_fullscreen_size = pygame.display.get_surface().get_size()
-                
-                # Set to fullscreen mode
-                self.window = pygame.display.set_mode(
-                    (0, 0),  # Use current desktop resolution
-                    DOUBLEBUF | pygame.FULLSCREEN
-                )
-                self.add_debug_message("Switched to fullscreen mode")
-            else:
-                # Restore previous window size
-                self.window = pygame.display.set_mode(
-                    self.pre_fullscreen_size,
-                    DOUBLEBUF
-                )
-                self.add_debug_message("Switched to windowed mode")
-                
-            # Reset the projection matrix for the new aspect ratio
-            width, height = pygame.display.get_surface().get_size()
-            aspect_ratio = width / height if height > 0 else 1.0
-            
-            # Return to modelview matrix
-            # glMatrixMode(GL_MODELVIEW)
-            
-        except Exception as e:
-            self.add_debug_message(f"Error toggling fullscreen: {e}")
-    
     def handle_key_event(self, event):
         """Handle keyboard events."""
         try:
@@ -1813,7 +1526,7 @@ class GUI3DPlugin(Plugin):
     def handle_mouse_button_up(self, event):
         """Handle mouse button up events."""
         try:
-            if hasattr(self, 'dragging') and self.dragging:
+            if self.dragging:
                 self.dragging = False
                 
         except Exception as e:
@@ -1822,9 +1535,9 @@ class GUI3DPlugin(Plugin):
     def handle_mouse_motion(self, event):
         """Handle mouse motion events."""
         try:
-            if hasattr(self, 'dragging') and self.dragging:
+            if self.dragging:
                 x, y = pygame.mouse.get_pos()
-                if hasattr(self, 'last_mouse_pos') and self.last_mouse_pos:
+                if self.last_mouse_pos:
                     dx = x - self.last_mouse_pos[0]
                     dy = y - self.last_mouse_pos[1]
                     # Use dx and dy for dragging functionality
@@ -668,7 +668,8 @@ class NetworkPlugin(Plugin):
             self.game.screen.addstr(len(options) + 18, 0, "- Use 127.0.0.1 to connect on same machine")
             self.game.screen.addstr(len(options) + 19, 0, "- Use local IP for LAN connections (e.g. 192.168.x.x)")
             
-            self.game.screen.refresh()
+            self.game.screen.noutrefresh()
+            curses.doupdate()
             
             # Handle input
             key = self.game.screen.getch()
@@ -797,7 +798,8 @@ class NetworkPlugin(Plugin):
                     self.game.screen.addstr(i + 2, 4, option)
                     
             self.game.screen.addstr(len(options) + 3, 0, "Press ESC to cancel")
-            self.game.screen.refresh()
+            self.game.screen.noutrefresh()
+            curses.doupdate()
             
             # Handle input
             key = self.game.screen.getch()
@@ -3,7 +3,6 @@ import random
 import numpy as np
 from plugins.base import Plugin
 from plugins.graph_classifier import GraphClassifier
-from plugins.gui_3d import Character3D
 
 class Polygraph3DClassifier(GraphClassifier):
     """
@@ -45,6 +44,13 @@ class Polygraph3DClassifier(GraphClassifier):
                         random.randint(0, 360), random.random() * 6 + 4) 
                        for _ in range(5)]  # Add canyons
         }
+        
+        # Precompute the rotation (cos, sin) of each ridge and canyon angle
+        self.terrain_rotations = {
+            feature: [(math.cos(math.radians(params[4])), math.sin(math.radians(params[4])))
+                      for params in self.terrain_params[feature]]
+            for feature in ('ridges', 'canyons')
+        }
     
     def get_height(self, x, y):
         """
@@ -179,13 +185,10 @@ class Polygraph3DClassifier(GraphClassifier):
                 height += plateau_height
         
         # Add ridges (elongated mountains along a direction)
-        for rx, ry, length, width, angle, height_factor in self.terrain_params['ridges']:
+        for (rx, ry, length, width, angle, height_factor), (cos_angle, sin_angle) in zip(
+                self.terrain_params['ridges'], self.terrain_rotations['ridges']):
             # Calculate distance to the ridge line
             # Rotate the point around the ridge center
-            angle_rad = math.radians(angle)
-            cos_angle = math.cos(angle_rad)
-            sin_angle = math.sin(angle_rad)
-            
             # Translate to ridge center
             tx = x - rx
             ty = y - ry
@@ -204,13 +207,10 @@ class Polygraph3DClassifier(GraphClassifier):
                     height += ridge_height
         
         # Add canyons (elongated valleys)
-        for cx, cy, length, width, angle, depth_factor in self.terrain_params['canyons']:
+        for (cx, cy, length, width, angle, depth_factor), (cos_angle, sin_angle) in zip(
+                self.terrain_params['canyons'], self.terrain_rotations['canyons']):
             # Calculate distance to the canyon line
             # Rotate the point around the canyon center
-            angle_rad = math.radians(angle)
-            cos_angle = math.cos(angle_rad)
-            sin_angle = math.sin(angle_rad)
-            
             # Translate to canyon center
             tx = x - cx
             ty = y - cy
@@ -246,7 +246,14 @@ class Polygraph3DPlugin(Plugin):
         super().__init__(game)
         self.classifier = Polygraph3DClassifier()
         self.original_get_char = None
-        self.height_map = {}  # Cache for height values
+        self.height_map = {}  # Cache for height values, keyed by (x, y)
+        
+        # Player position when the height cache was last reset
+        self.last_player_x = None
+        self.last_player_y = None
+        
+        # Game frame and view settings the 3D map was last built for
+        self._last_frame_key = None
         
         # Height settings
         self.min_height = -10
@@ -290,7 +297,7 @@ class Polygraph3DPlugin(Plugin):
             y = int(round(y))
             
         # Check if the height is already cached
-        key = f"{x},{y}"
+        key = (x, y)
         if key in self.height_map:
             return self.height_map[key]
 
@@ -307,7 +314,7 @@ class Polygraph3DPlugin(Plugin):
         # Add a small deterministic variation based on coordinates to ensure
         # no two adjacent positions have exactly the same height
         # Use a hash of the coordinates to get a consistent but varied value
-        variation = (hash(key) % 1000) / 2000.0 - 0.25  # Range: -0.25 to 0.25
+        variation = (hash(f"{x},{y}") % 1000) / 2000.0 - 0.25  # Range: -0.25 to 0.25
         height += variation
         
         # Cache the height
@@ -325,12 +332,11 @@ class Polygraph3DPlugin(Plugin):
         player_x = self.game.world_x
         player_y = self.game.world_y
         
-        if (hasattr(self, 'last_player_x') and hasattr(self, 'last_player_y') and
-            (abs(player_x - self.last_player_x) > 10 or abs(player_y - self.last_player_y) > 10)):
-            self.height_map = {}
+        if self.last_player_x is None:
             self.last_player_x = player_x
             self.last_player_y = player_y
-        elif not hasattr(self, 'last_player_x') or not hasattr(self, 'last_player_y'):
+        elif abs(player_x - self.last_player_x) > 10 or abs(player_y - self.last_player_y) > 10:
+            self.height_map = {}
             self.last_player_x = player_x
             self.last_player_y = player_y
     
@@ -352,74 +358,88 @@ class Polygraph3DPlugin(Plugin):
             if not self_gui.active or not self_gui.running:
                 return
                 
-            # Clear existing characters
-            with self_gui.lock:
-                self_gui.characters = {}
-            
+            # World changes and player moves are drawn as a new game frame, so
+            # skip updates until there is one (or a view setting changed)
+            game = self_gui.game
+            frame_key = (game.frame_version, self_gui.render_distance, self.height_scale)
+            if frame_key == self._last_frame_key:
+                return
+                
             # Get visible area dimensions
-            max_y, max_x = self_gui.game.max_y, self_gui.game.max_x
+            max_y, max_x = game.max_y, game.max_x
             
-            # First, update the height map with the visible area
-            for y in range(max_y):
-                for x in range(max_x):
-                    # Calculate world coordinates
-                    world_x = x - max_x // 2 + self_gui.game.world_x
-                    world_y = y - max_y // 2 + self_gui.game.world_y
-                    
-                    # Get the character at this position
-                    char = self_gui.game.get_char_at(world_x, world_y)
-                    
-                    # Skip spaces
-                    if char == ' ':
-                        continue
-                        
-                    # Get the height from our plugin (this updates the cache)
-                    self.get_height(world_x, world_y)
+            # Hoist attribute lookups out of the loops below
+            get_char_at = game.get_char_at
+            get_height = self.get_height
+            height_scale = self.height_scale
+            origin_x = game.world_x
+            origin_y = game.world_y
+            left = origin_x - max_x // 2
+            top = origin_y - max_y // 2
             
-            # Create a copy of the height map to avoid modification during iteration
-            height_map_copy = dict(self.height_map)
+            # Fetch the whole visible area in one call
+            grid = game.get_chars_grid(left, top, max_x, max_y)
             
-            # Now visualize all cached terrain points, not just the visible area
-            for key, height in height_map_copy.items():
-                try:
-                    # Parse the coordinates from the key
-                    # Handle floating-point coordinates by converting to float first, then to int
-                    coords = key.split(',')
-                    world_x = int(float(coords[0]))
-                    world_y = int(float(coords[1]))
-                    
-                    # Get the character at this position
-                    char = self_gui.game.get_char_at(world_x, world_y)
-                    
-                    # If there's no character (e.g., it's outside the loaded area), use a default
-                    if char == ' ':
-                        char = '.'  # Use a dot to represent terrain without a character
-                    
-                    # Determine color based on character
-                    color = self_gui.get_color_for_char(char, world_x, world_y)
-                    
-                    # Calculate the visual height
-                    visual_height = height / self.height_scale
-                    
-                    # Create a 3D character object with the explicit height value
-                    char_obj = Character3D(
-                        char, 
-                        world_x - self_gui.game.world_x, 
-                        world_y - self_gui.game.world_y, 
-                        color,
-                        height=visual_height  # Pass height directly
-                    )
+            # First, update the height map with the visible area (spaces are skipped)
+            rows, cols = np.nonzero(grid != ord(' '))
+            for world_y, world_x in zip((rows + top).tolist(), (cols + left).tolist()):
+                # Get the height from our plugin (this updates the cache)
+                get_height(world_x, world_y)
+            
+            # Now visualize all cached terrain points, not just the visible area,
+            # as flat arrays: world coordinates (N, 2) and heights (N,)
+            count = len(self.height_map)
+            coords = np.array(list(self.height_map), dtype=np.int64).reshape(count, 2)
+            heights = np.fromiter(self.height_map.values(), dtype=np.float32, count=count)
+            
+            # Drop points beyond the render distance from the player before
+            # looking up their characters
+            render_distance = self_gui.render_distance
+            in_range = np.maximum(np.abs(coords[:, 0] - origin_x),
+                                  np.abs(coords[:, 1] - origin_y)) <= render_distance
+            if not in_range.all():
+                coords = coords[in_range]
+                heights = heights[in_range]
+                count = len(coords)
+            
+            # Get the character at each position, from the grid when it is visible
+            grid_x = coords[:, 0] - left
+            grid_y = coords[:, 1] - top
+            visible = (grid_x >= 0) & (grid_x < max_x) & (grid_y >= 0) & (grid_y < max_y)
+            codes = np.empty(count, dtype=np.uint8)
+            codes[visible] = grid[grid_y[visible], grid_x[visible]]
+            hidden = np.flatnonzero(~visible)
+            if len(hidden):
+                codes[hidden] = [ord(get_char_at(world_x, world_y)) & 0xFF
+                                 for world_x, world_y in coords[hidden].tolist()]
+                
+            # If there's no character (e.g., it's outside the loaded area), use a dot
+            # to represent terrain without a character
+            codes[codes == ord(' ')] = ord('.')
+            
+            # Positions relative to the player, with the visual height as the y axis
+            positions = np.empty((len(codes), 3), dtype=np.float32)
+            positions[:, 0] = coords[:, 0] - origin_x
+            positions[:, 1] = heights / height_scale
+            positions[:, 2] = coords[:, 1] - origin_y
+            colors = self_gui.get_colors_for_codes(codes)
                     
-                    # Add to the character map
-                    with self_gui.lock:
-                        char_key = f"{world_x},{world_y}"
-                        self_gui.characters[char_key] = char_obj
-                except ValueError as e:
-                    # Skip invalid coordinates
-                    continue
+            # Swap in the new arrays with a single lock acquisition
+            with self_gui.lock:
+                self_gui.char_positions = positions
+                self_gui.char_codes = codes
+                self_gui.char_colors = colors
+                self_gui._dirty = True
+                
+            # Only a published update counts; a failed one is retried next tick
+            self._last_frame_key = frame_key
         
         # Replace the method - this is the key fix
         gui_plugin.update_character_map = lambda: new_update_character_map(gui_plugin)
+        
+        # Neither map builder may skip its first update on a stale cache
+        self._last_frame_key = None
+        gui_plugin.reset_character_map_cache()
     
     def load_settings(self):
         """Load settings from a file."""
@@ -506,8 +526,9 @@ class Polygraph3DPlugin(Plugin):
             self.game.screen.addstr(max_y - 2, 0, "═" * (max_x - 1))
             self.game.screen.addstr(max_y - 1, 0, "R: Reset to defaults")
             
-            # Refresh screen
-            self.game.screen.refresh()
+            # Refresh screen in a single update
+            self.game.screen.noutrefresh()
+            curses.doupdate()
             
             # Get input
             key = self.game.screen.getch()
@@ -599,3 +620,6 @@ class Polygraph3DPlugin(Plugin):
             # If we have a reference to the GUI plugin, restore its original method
             if hasattr(self.gui_plugin_ref, 'original_update_character_map'):
                 self.gui_plugin_ref.update_character_map = self.gui_plugin_ref.original_update_character_map
+                
+                # The scan cache predates the polygraph terrain now on screen
+                self.gui_plugin_ref.reset_character_map_cache()
@@ -7,6 +7,7 @@ import json
 import hashlib
 import os
 import signal
+import numpy as np
 from plugins.base import Plugin
 from plugins.snake import SnakePlugin
 from plugins.graph_classifier import GraphClassifierPlugin
@@ -55,6 +56,9 @@ class TextAdventure:
         self.last_key = 0
         # Flag to indicate if redraw is needed
         self.needs_redraw = True
+        # Counts the frames drawn so far; plugins that read the screen back can
+        # skip work while it is unchanged
+        self.frame_version = 0
         # Flag to check for window resize
         self.check_resize = True
         # FPS tracking
@@ -104,6 +108,9 @@ class TextAdventure:
         }
         # Store spaces created by the user
         self.spaces = self.load_spaces()
+        # Coordinates of the spaces as an (S, 2) array, rebuilt when spaces are added
+        self._space_coords = None
+        self._space_coords_count = -1
         # Message to display
         self.message = ""
         self.message_timeout = 0
@@ -138,6 +145,21 @@ class TextAdventure:
         
         # Initialize key bindings
         self.key_bindings = KeyBindings()
+        self.refresh_key_cache()
+
+    def refresh_key_cache(self):
+        """Resolve the terminal key bindings to key codes used by handle_input."""
+        keys = self.key_bindings.terminal_keys
+        self._k_move_up = keys["move_up"]
+        self._k_move_down = keys["move_down"]
+        self._k_move_left = keys["move_left"]
+        self._k_move_right = keys["move_right"]
+        self._k_move_up_left = keys["move_up_left"]
+        self._k_move_up_right = keys["move_up_right"]
+        self._k_move_down_left = keys["move_down_left"]
+        self._k_move_down_right = keys["move_down_right"]
+        self._k_rotate_ccw = keys["rotate_ccw"]
+        self._k_rotate_cw = keys["rotate_cw"]
 
     def load_plugins(self):
         """Load plugins."""
@@ -194,8 +216,13 @@ class TextAdventure:
         # Get screen dimensions
         self.max_y, self.max_x = self.screen.getmaxyx()
         
+        # Menu separator line, rebuilt only when the screen width changes
+        self._menu_separator = None
+        self._menu_separator_width = None
+        
         # Setup colors
-        self.screen.timeout(50)  # Non-blocking input with 50ms timeout
+        self.input_timeout = 50  # Non-blocking input with 50ms timeout
+        self.screen.timeout(self.input_timeout)
         
     def initialize_colors(self):
         """Initialize color pairs for the game."""
@@ -323,38 +350,39 @@ class TextAdventure:
         self.dx = 0
         self.dy = 0
         
-        # Use key bindings for movement
-        if self.key_states.get(self.key_bindings.terminal_keys["move_up"], False):
+        # Use key bindings for movement (key codes are cached by refresh_key_cache)
+        key_pressed = self.key_states.get
+        if key_pressed(self._k_move_up, False):
             self.dy = -1
-        if self.key_states.get(self.key_bindings.terminal_keys["move_down"], False):
+        if key_pressed(self._k_move_down, False):
             self.dy = 1
-        if self.key_states.get(self.key_bindings.terminal_keys["move_left"], False):
+        if key_pressed(self._k_move_left, False):
             self.dx = -1
-        if self.key_states.get(self.key_bindings.terminal_keys["move_right"], False):
+        if key_pressed(self._k_move_right, False):
             self.dx = 1
         
         # Diagonal movement
-        if self.key_states.get(self.key_bindings.terminal_keys["move_up_left"], False):
+        if key_pressed(self._k_move_up_left, False):
             self.dx = -1
             self.dy = -1
-        if self.key_states.get(self.key_bindings.terminal_keys["move_up_right"], False):
+        if key_pressed(self._k_move_up_right, False):
             self.dx = 1
             self.dy = -1
-        if self.key_states.get(self.key_bindings.terminal_keys["move_down_left"], False):
+        if key_pressed(self._k_move_down_left, False):
             self.dx = -1
             self.dy = 1
-        if self.key_states.get(self.key_bindings.terminal_keys["move_down_right"], False):
+        if key_pressed(self._k_move_down_right, False):
             self.dx = 1
             self.dy = 1
             
         # Rotation
-        if self.key_states.get(self.key_bindings.terminal_keys["rotate_ccw"], False):
+        if key_pressed(self._k_rotate_ccw, False):
             # Find the GUI3D plugin and rotate counter-clockwise
             for plugin in self.plugins:
                 if isinstance(plugin, GUI3DPlugin) and plugin.active:
                     plugin.rotation_y += plugin.rotation_speed
                     break
-        if self.key_states.get(self.key_bindings.terminal_keys["rotate_cw"], False):
+        if key_pressed(self._k_rotate_cw, False):
             # Find the GUI3D plugin and rotate clockwise
             for plugin in self.plugins:
                 if isinstance(plugin, GUI3DPlugin) and plugin.active:
@@ -642,17 +670,16 @@ class TextAdventure:
             # Render UI elements
             self.render_ui()
             
-            # Force a refresh to ensure all terminal drawing is complete
-            # before any plugins (like 3D GUI) start reading from the screen
-            self.screen.refresh()
-            
             # Render plugins
             for plugin in self.plugins:
                 if plugin.active:
                     plugin.render(self.screen)
         
-        self.screen.refresh()
+        # Send the whole frame to the terminal in one update
+        self.screen.noutrefresh()
+        curses.doupdate()
         self.needs_redraw = False
+        self.frame_version += 1
 
     def render_coordinate_notches(self):
         """Render coordinate notches on the left and top of the game world."""
@@ -782,33 +809,35 @@ class TextAdventure:
             pass
         
         # Adjust visible area to account for notch margins and ensure we stay within the border
-        for y in range(render_top, render_bottom):
-            for x in range(render_left, render_right):
-                # Calculate world coordinates
-                world_x = x - half_width + self.world_x
-                world_y = y - half_height + self.world_y
-                
-                # Get the character at this position
-                char = self.get_char_at(world_x, world_y)
-                
-                # Determine color based on character
-                color = self.background_color
-                # Don't apply player color to 'X' characters in the background
-                # Only the main player 'X' will get the player color
-                if char == '@':
-                    color = self.at_symbol_color
-                elif char == '0':
-                    color = self.zero_color
-                elif char == '&':
-                    color = self.fuel_color
-                elif char == '.':
-                    color = self.dot_color
-                
-                # Draw the character
-                try:
-                    self.screen.addch(y, x, char, color)
-                except:
-                    pass  # Ignore errors from writing to the bottom-right corner
+        width = render_right - render_left
+        height = render_bottom - render_top
+        if width > 0 and height > 0:
+            # Get the characters of the whole visible area in one call
+            grid = self.get_chars_grid(render_left - half_width + self.world_x,
+                                       render_top - half_height + self.world_y,
+                                       width, height)
+            
+            # Determine color based on character
+            # Don't apply player color to 'X' characters in the background
+            # Only the main player 'X' will get the player color
+            char_colors = {
+                '@': self.at_symbol_color,
+                '0': self.zero_color,
+                '&': self.fuel_color,
+                '.': self.dot_color
+            }
+            background_color = self.background_color
+            addch = self.screen.addch
+            
+            for y, row in enumerate(grid.tolist(), render_top):
+                for x, code in enumerate(row, render_left):
+                    char = chr(code)
+                    
+                    # Draw the character
+                    try:
+                        addch(y, x, char, char_colors.get(char, background_color))
+                    except:
+                        pass  # Ignore errors from writing to the bottom-right corner
         
         # Draw player at center of screen
         player_y = self.max_y // 2
@@ -938,6 +967,36 @@ class TextAdventure:
         self.char_cache[cache_key] = char
         return char
         
+    def get_chars_grid(self, x0, y0, w, h):
+        """Get the characters of a w*h region starting at (x0, y0) as a uint8 array indexed [y, x]"""
+        # If a plugin has replaced get_char_at, ask it for every cell
+        if getattr(self.get_char_at, '__func__', None) is not type(self).get_char_at:
+            get_char_at = self.get_char_at
+            return np.array([[ord(get_char_at(x, y)) for x in range(x0, x0 + w)]
+                             for y in range(y0, y0 + h)], dtype=np.uint8).reshape(h, w)
+        
+        # Calculate the location IDs for the whole region at once
+        xs = np.arange(x0, x0 + w, dtype=np.int64)
+        ys = np.arange(y0, y0 + h, dtype=np.int64)
+        grid = ((xs[np.newaxis, :] + ys[:, np.newaxis] * 1000) % 127).astype(np.uint8)
+        
+        # Blank out the spaces that fall inside the region
+        coords = self.get_space_coords()
+        if len(coords):
+            sx = coords[:, 0] - x0
+            sy = coords[:, 1] - y0
+            inside = (sx >= 0) & (sx < w) & (sy >= 0) & (sy < h)
+            grid[sy[inside], sx[inside]] = ord(' ')
+        return grid
+        
+    def get_space_coords(self):
+        """Get the coordinates of all spaces as an (S, 2) integer array"""
+        # Spaces are only ever added, so the count tells whether the array is stale
+        if self._space_coords_count != len(self.spaces):
+            self._space_coords = np.array(list(self.spaces.values()), dtype=np.int64).reshape(-1, 2)
+            self._space_coords_count = len(self.spaces)
+        return self._space_coords
+        
     def update_char_cache(self):
         """Update the character cache when player moves."""
         # Only update if player has moved
@@ -1082,12 +1141,12 @@ class TextAdventure:
             
             # Draw header
             self.screen.addstr(0, 0, "Color Settings", self.menu_color | curses.A_BOLD)
-            self.screen.addstr(1, 0, "═" * (self.max_x - 1), self.menu_color)
+            self.screen.addstr(1, 0, self.get_menu_separator(), self.menu_color)
             
             # Draw instructions
             self.screen.addstr(2, 0, "Use ↑/↓ to select an element, ←/→ to change foreground/background color", self.menu_color)
             self.screen.addstr(3, 0, "Press ENTER to apply changes, ESC to exit", self.menu_color)
-            self.screen.addstr(4, 0, "═" * (self.max_x - 1), self.menu_color)
+            self.screen.addstr(4, 0, self.get_menu_separator(), self.menu_color)
             
             # Draw color settings
             for i, name in enumerate(color_names):
@@ -1118,11 +1177,12 @@ class TextAdventure:
                     pass
             
             # Draw footer
-            self.screen.addstr(self.max_y - 2, 0, "═" * (self.max_x - 1), self.menu_color)
+            self.screen.addstr(self.max_y - 2, 0, self.get_menu_separator(), self.menu_color)
             self.screen.addstr(self.max_y - 1, 0, "R: Reset to defaults", self.menu_color)
             
-            # Refresh screen
-            self.screen.refresh()
+            # Refresh screen in a single update
+            self.screen.noutrefresh()
+            curses.doupdate()
             
             # Get input
             key = self.screen.getch()
@@ -1353,6 +1413,31 @@ class TextAdventure:
         # Show the audio menu
         audio_plugin.show_audio_menu()
 
+    def get_menu_separator(self):
+        """Return the separator line used by menus for the current screen width."""
+        if self._menu_separator_width != self.max_x:
+            self._menu_separator = "═" * (self.max_x - 1)
+            self._menu_separator_width = self.max_x
+        return self._menu_separator
+
+    def read_keys(self):
+        """Wait for a key and return it together with any keys queued behind it."""
+        key = self.screen.getch()
+        if key == -1:
+            return []
+            
+        # Drain whatever else is already buffered without waiting
+        keys = [key]
+        self.screen.timeout(0)
+        try:
+            key = self.screen.getch()
+            while key != -1:
+                keys.append(key)
+                key = self.screen.getch()
+        finally:
+            self.screen.timeout(self.input_timeout)
+        return keys
+
     def show_key_bindings_menu(self):
         """Show the key bindings menu."""
         # Variables for menu navigation
@@ -1367,53 +1452,67 @@ class TextAdventure:
             "Back to Main Menu"
         ]
         
+        redraw_all = True
+        addstr = self.screen.addstr
+        menu_color = self.menu_color
+        selected_color = menu_color | curses.A_BOLD
+        
         # Main loop for key bindings menu
         while in_key_bindings_menu:
-            # Clear screen
-            self.screen.clear()
-            
-            # Draw header
-            self.screen.addstr(0, 0, "Key Bindings Settings", self.menu_color | curses.A_BOLD)
-            self.screen.addstr(1, 0, "═" * (self.max_x - 1), self.menu_color)
-            
-            # Draw instructions
-            self.screen.addstr(2, 0, "Use ↑/↓ to select an option, ENTER to select", self.menu_color)
-            self.screen.addstr(3, 0, "Press ESC to exit", self.menu_color)
-            self.screen.addstr(4, 0, "═" * (self.max_x - 1), self.menu_color)
-            
-            # Draw menu options
-            for i, option in enumerate(menu_options):
-                # Highlight the selected item
-                if i == current_selection:
-                    attr = self.menu_color | curses.A_BOLD
-                else:
-                    attr = self.menu_color
+            if redraw_all:
+                separator = self.get_menu_separator()
                 
-                # Draw the item
-                self.screen.addstr(i + 6, 2, option, attr)
+                # Clear screen
+                self.screen.clear()
+                
+                # Draw header
+                addstr(0, 0, "Key Bindings Settings", selected_color)
+                addstr(1, 0, separator, menu_color)
+                
+                # Draw instructions
+                addstr(2, 0, "Use ↑/↓ to select an option, ENTER to select", menu_color)
+                addstr(3, 0, "Press ESC to exit", menu_color)
+                addstr(4, 0, separator, menu_color)
+                
+                # Draw footer
+                addstr(self.max_y - 2, 0, separator, menu_color)
+                
+                dirty_rows = set(range(len(menu_options)))
+                redraw_all = False
             
-            # Draw footer
-            self.screen.addstr(self.max_y - 2, 0, "═" * (self.max_x - 1), self.menu_color)
+            # Draw the menu options that changed since the last pass,
+            # highlighting the selected item
+            for i in dirty_rows:
+                addstr(i + 6, 2, menu_options[i], selected_color if i == current_selection else menu_color)
+            dirty_rows.clear()
             
-            # Refresh screen
-            self.screen.refresh()
+            # Push the changes to the terminal in one update
+            self.screen.noutrefresh()
+            curses.doupdate()
             
             # Get input
             key = self.screen.getch()
             
             # Handle input
             if key == curses.KEY_UP:
+                dirty_rows.add(current_selection)
                 current_selection = (current_selection - 1) % len(menu_options)
+                dirty_rows.add(current_selection)
             elif key == curses.KEY_DOWN:
+                dirty_rows.add(current_selection)
                 current_selection = (current_selection + 1) % len(menu_options)
+                dirty_rows.add(current_selection)
             elif key == 10:  # Enter key
                 if current_selection == 0:  # Terminal Controls
                     self.show_terminal_key_bindings()
+                    redraw_all = True
                 elif current_selection == 1:  # 3D GUI Controls
                     self.show_gui_key_bindings()
+                    redraw_all = True
                 elif current_selection == 2:  # Reset All to Defaults
                     self.key_bindings.reset_to_defaults()
                     self.key_bindings.save_bindings()
+                    self.refresh_key_cache()
                     self.message = "All key bindings reset to defaults"
                     self.message_timeout = 2.0
                 elif current_selection == 3:  # Back to Main Menu
@@ -1438,12 +1537,12 @@ class TextAdventure:
             
             # Draw header
             self.screen.addstr(0, 0, "Terminal Key Bindings", self.menu_color | curses.A_BOLD)
-            self.screen.addstr(1, 0, "═" * (self.max_x - 1), self.menu_color)
+            self.screen.addstr(1, 0, self.get_menu_separator(), self.menu_color)
             
             # Draw instructions
             self.screen.addstr(2, 0, "Use ↑/↓ to select a key binding, ENTER to edit", self.menu_color)
             self.screen.addstr(3, 0, "Press ESC to exit", self.menu_color)
-            self.screen.addstr(4, 0, "═" * (self.max_x - 1), self.menu_color)
+            self.screen.addstr(4, 0, self.get_menu_separator(), self.menu_color)
             
             # Draw key bindings
             for i, key in enumerate(key_bindings):
@@ -1462,10 +1561,11 @@ class TextAdventure:
                 self.screen.addstr(i + 6, 2, f"{action_desc}: {key_name}", attr)
             
             # Draw footer
-            self.screen.addstr(self.max_y - 2, 0, "═" * (self.max_x - 1), self.menu_color)
+            self.screen.addstr(self.max_y - 2, 0, self.get_menu_separator(), self.menu_color)
             
-            # Refresh screen
-            self.screen.refresh()
+            # Refresh screen in a single update
+            self.screen.noutrefresh()
+            curses.doupdate()
             
             # Get input
             key = self.screen.getch()
@@ -1509,35 +1609,39 @@ class TextAdventure:
         new_key = None
         editing = True
         
+        # Draw the prompt once; nothing on it changes while waiting for a key
+        self.screen.clear()
+        
+        # Draw header
+        self.screen.addstr(0, 0, "Edit Key Binding", self.menu_color | curses.A_BOLD)
+        self.screen.addstr(1, 0, self.get_menu_separator(), self.menu_color)
+        
+        # Draw instructions
+        self.screen.addstr(2, 0, "Press a key to bind it to this action", self.menu_color)
+        self.screen.addstr(3, 0, "Press ESC to cancel", self.menu_color)
+        self.screen.addstr(4, 0, self.get_menu_separator(), self.menu_color)
+        
+        # Draw current key binding
+        self.screen.addstr(6, 2, f"Current key binding: {self.key_bindings.terminal_keys[key]}", self.menu_color)
+        
+        # Push the prompt to the terminal in one update
+        self.screen.noutrefresh()
+        curses.doupdate()
+        
         # Main loop for editing
         while editing:
-            # Clear screen
-            self.screen.clear()
-            
-            # Draw header
-            self.screen.addstr(0, 0, "Edit Key Binding", self.menu_color | curses.A_BOLD)
-            self.screen.addstr(1, 0, "═" * (self.max_x - 1), self.menu_color)
-            
-            # Draw instructions
-            self.screen.addstr(2, 0, "Press a key to bind it to this action", self.menu_color)
-            self.screen.addstr(3, 0, "Press ESC to cancel", self.menu_color)
-            self.screen.addstr(4, 0, "═" * (self.max_x - 1), self.menu_color)
-            
-            # Draw current key binding
-            self.screen.addstr(6, 2, f"Current key binding: {self.key_bindings.terminal_keys[key]}", self.menu_color)
-            
-            # Refresh screen
-            self.screen.refresh()
-            
             # Get input
             new_key = self.screen.getch()
             
             # Handle input
-            if new_key == 27:  # Escape key
+            if new_key == -1:  # No key pressed before the input timeout
+                continue
+            elif new_key == 27:  # Escape key
                 editing = False
             else:
                 # Update the key binding
                 self.key_bindings.terminal_keys[key] = new_key
+                self.refresh_key_cache()
                 editing = False
         
         # Force redraw